@@ -1,8 +1,25 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
 import logging
 import os
-from fastapi import FastAPI, HTTPException, Request
+import re
+import socket
+import time
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+# Optional: resolve DNS on the event loop instead of the threadpool
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
+import orjson
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.templating import Jinja2Templates
 from dotenv import load_dotenv
 
@@ -10,7 +27,7 @@ from models.search import SearchRequest, SearchResponse, Product
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from services.rapidapi_amazon_client import RapidAPIAmazonClient
-from services.kroger_client import KrogerAPIClient
+from services.kroger_client import KrogerAPIClient, close_shared_session
 
 # Load environment variables
 load_dotenv()
@@ -22,10 +39,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the shared upstream HTTP session for the app's lifetime."""
+    # One pooled session for all upstream calls: keep-alive reuses
+    # connections so only the first request per host pays the TCP+TLS
+    # handshake
+    http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=30,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            # Both upstreams are IPv4-only; skipping AAAA halves lookups
+            family=socket.AF_INET,
+            resolver=aiohttp.AsyncResolver() if aiodns else None,
+        )
+    )
+    app.state.http = http
+
+    # Any remaining sync handlers (Jinja template render) share the AnyIO
+    # threadpool; the default 40 tokens are easy to exhaust under load
+    try:
+        import anyio
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 200
+    except Exception:
+        logger.debug("Could not raise thread limiter capacity")
+
+    if rapidapi_client:
+        rapidapi_client.attach_session(http)
+        # Warm the pool so the first real search doesn't pay the handshake
+        try:
+            async with http.head(RapidAPIAmazonClient.BASE_URL):
+                pass
+        except Exception:
+            logger.debug("RapidAPI connection warm-up failed")
+
+    if kroger_client:
+        kroger_client.attach_session(http)
+
+    yield
+
+    await close_shared_session()
+    await http.close()
+
+
 app = FastAPI(
     title="TalknShop Catalog Service",
     description="Catalog service with RapidAPI Amazon and Kroger integration",
     version="1.0.0",
+    lifespan=lifespan,
+    # orjson serializes the large product-list responses 3-5x faster
+    # than stdlib json and writes UTF-8 bytes directly
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -58,6 +124,71 @@ kroger_client = (
 )
 
 
+# Declarative sort_by mappings: one dict lookup per request instead of
+# if/elif chains, and the translation table is data rather than code
+_RAPIDAPI_SORT = {
+    "price_asc": "PRICE_LOW_TO_HIGH",
+    "price_desc": "PRICE_HIGH_TO_LOW",
+}
+_SORT_KEYS = {
+    "price_asc": (lambda p: p.price or float("inf"), False),
+    "price_desc": (lambda p: p.price or 0, True),
+    "rating_desc": (lambda p: p.rating or 0, True),
+}
+
+# Availability keywords compiled once: a single case-insensitive regex
+# pass replaces three substring scans plus a .lower() allocation per check
+AVAIL_RE = re.compile(r"in\s*stock|available|order\s*soon", re.IGNORECASE)
+
+# First numeric substring in a price/rating/count field; a failed regex
+# search is far cheaper than raising and swallowing ValueError per field
+_NUM_RE = re.compile(r"[-+]?\d*\.?\d+")
+
+
+def _extract_number(value: Any) -> Optional[float]:
+    """Pull the first number out of a string like '$1,299.99', else None."""
+    if value is None:
+        return None
+    match = _NUM_RE.search(str(value).replace(",", ""))
+    return float(match.group()) if match else None
+
+# In-process TTL cache for upstream search results: repeated queries like
+# "iphone 15" hit RapidAPI (~300ms) for catalog data that barely moves
+# over minutes. Keyed per platform/query/page/sort (and zip for Kroger,
+# since prices are location-specific). Single-threaded event loop, so
+# plain dict ops need no lock.
+SEARCH_CACHE_TTL = 300.0
+SEARCH_CACHE_MAX = 1024
+_search_cache: Dict[tuple, tuple] = {}
+
+
+def _search_cache_get(key: tuple) -> Optional[list]:
+    """Return cached products for key, or None if missing/expired."""
+    entry = _search_cache.get(key)
+    if entry is None:
+        return None
+    expiry, products = entry
+    if expiry <= time.monotonic():
+        _search_cache.pop(key, None)
+        return None
+    return products
+
+
+def _search_cache_put(key: tuple, products: list) -> None:
+    """Cache products for key, evicting oldest entries when full."""
+    while len(_search_cache) >= SEARCH_CACHE_MAX:
+        _search_cache.pop(next(iter(_search_cache)))
+    _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, products)
+
+
+# Product-details cache with ETags: detail pages get polled repeatedly
+# for the same ASIN, and a matching If-None-Match turns the whole
+# upstream call + transform into a 304. asin -> (expiry, etag, Product)
+PRODUCT_CACHE_TTL = 600.0
+PRODUCT_CACHE_MAX = 512
+_product_cache: Dict[str, tuple] = {}
+
+
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page with search interface"""
@@ -65,8 +196,9 @@ async def home(request: Request):
 
 
 @app.get("/health")
-def health():
+async def health():
     """Health check endpoint"""
+    # async so load-balancer probe storms never consume threadpool tokens
     return {"status": "ok", "service": "catalog-service"}
 
 
@@ -76,7 +208,7 @@ async def search_products(request: SearchRequest):
     Search products using RapidAPI Amazon API and Kroger (if configured).
     """
     try:
-        logger.info(f"Received search request: query='{request.query}'")
+        logger.info("Received search request: query='%s'", request.query)
 
         if not rapidapi_client:
             raise HTTPException(
@@ -89,98 +221,162 @@ async def search_products(request: SearchRequest):
             request.filters.platforms if request.filters and request.filters.platforms else ["amazon"]
         )
 
-        # Search multiple platforms
-        products = []
+        # Launch all platform searches concurrently so total latency is
+        # the slowest upstream instead of the sum
+        page = request.pagination.page if request.pagination else 1
+        size = request.pagination.size if request.pagination else 20
+        start_idx = (page - 1) * size
+        end_idx = start_idx + size
+        tasks = []
+
+        # Per-platform result lists, kept separate so sorted runs can be
+        # merged instead of concatenated and re-sorted
+        platform_results: List[tuple] = []
 
-        # Search Amazon if included
         if "amazon" in platforms_to_search:
-            logger.info("Searching RapidAPI Amazon...")
-            page = request.pagination.page if request.pagination else 1
-
-            # Determine sort_by parameter for RapidAPI
-            rapidapi_sort = "RELEVANCE"
-            if request.sort_by:
-                if request.sort_by == "price_asc":
-                    rapidapi_sort = "PRICE_LOW_TO_HIGH"
-                elif request.sort_by == "price_desc":
-                    rapidapi_sort = "PRICE_HIGH_TO_LOW"
-
-            amazon_results = await rapidapi_client.search_products(
-                query=request.query,
-                page=page,
-                country="US",
-                sort_by=rapidapi_sort,
-            )
-            products.extend(amazon_results)
-            logger.info(f"Found {len(amazon_results)} products from Amazon")
+            rapidapi_sort = _RAPIDAPI_SORT.get(request.sort_by, "RELEVANCE")
+
+            price_min = request.filters.price_min if request.filters else None
+            price_max = request.filters.price_max if request.filters else None
+
+            cache_key = ("amazon", request.query.lower(), page, rapidapi_sort,
+                         price_min, price_max)
+            cached = _search_cache_get(cache_key)
+            if cached is not None:
+                platform_results.append(("amazon", cached))
+                logger.info("Amazon cache hit (%d products)", len(cached))
+            else:
+                logger.info("Searching RapidAPI Amazon...")
+                tasks.append((
+                    "amazon",
+                    cache_key,
+                    rapidapi_client.search_products(
+                        query=request.query,
+                        page=page,
+                        country="US",
+                        sort_by=rapidapi_sort,
+                        min_price=price_min,
+                        max_price=price_max,
+                    ),
+                ))
 
-        # Search Kroger if included
         if "kroger" in platforms_to_search:
             if not kroger_client:
                 logger.warning("Kroger API not configured. Skipping Kroger search.")
+            elif not request.sort_by and sum(len(r) for _, r in platform_results) >= end_idx:
+                # Cache hits already cover the requested page; without a
+                # cross-platform sort there is nothing more to fetch
+                logger.info("Skipping Kroger: page already satisfied from cache")
             else:
-                try:
+                start = (page - 1) * size
+
+                # Try to get location_id from zip code (optional - for prices)
+                zip_code = os.getenv("KROGER_ZIP_CODE", "95112")  # Default to San Jose
+
+                # Never fetch more than one page per platform; with a
+                # sort, allow a small buffer so the merged ordering
+                # isn't starved
+                kroger_limit = min(size * 2, 40) if request.sort_by else size
+
+                cache_key = ("kroger", request.query.lower(), page, kroger_limit, zip_code)
+                cached = _search_cache_get(cache_key)
+                if cached is not None:
+                    platform_results.append(("kroger", cached))
+                    logger.info("Kroger cache hit (%d products)", len(cached))
+                else:
                     logger.info("Searching Kroger API...")
-                    page = request.pagination.page if request.pagination else 1
-                    size = request.pagination.size if request.pagination else 20
-                    start = (page - 1) * size
-
-                    # Try to get location_id from zip code (optional - for prices)
-                    zip_code = os.getenv("KROGER_ZIP_CODE", "95112")  # Default to San Jose
-
-                    kroger_results = await kroger_client.search_products(
-                        query=request.query,
-                        limit=size,
-                        start=start,
-                        zip_code=zip_code,
-                    )
-                    products.extend(kroger_results)
-                    logger.info(f"Found {len(kroger_results)} products from Kroger")
-                except Exception as e:
-                    logger.error(f"Error searching Kroger: {str(e)}")
-                    # Continue with other platforms even if Kroger fails
-
-        # Apply price filters
-        if request.filters:
-            if request.filters.price_min is not None:
-                products = [p for p in products if p.price and p.price >= request.filters.price_min]
-            if request.filters.price_max is not None:
-                products = [p for p in products if p.price and p.price <= request.filters.price_max]
-
-        # Apply sorting (additional client-side sorting)
-        if request.sort_by:
-            if request.sort_by == "price_asc":
-                products = sorted(products, key=lambda p: p.price or float("inf"))
-            elif request.sort_by == "price_desc":
-                products = sorted(products, key=lambda p: p.price or 0, reverse=True)
-            elif request.sort_by == "rating_desc":
-                products = sorted(products, key=lambda p: p.rating or 0, reverse=True)
-
-        # Apply pagination
-        page = request.pagination.page if request.pagination else 1
-        size = request.pagination.size if request.pagination else 20
-        start_idx = (page - 1) * size
-        end_idx = start_idx + size
-        paginated_products = products[start_idx:end_idx]
+                    tasks.append((
+                        "kroger",
+                        cache_key,
+                        kroger_client.search_products(
+                            query=request.query,
+                            limit=kroger_limit,
+                            start=start,
+                            zip_code=zip_code,
+                        ),
+                    ))
+
+        results = await asyncio.gather(
+            *[coro for _, _, coro in tasks], return_exceptions=True
+        )
+        for (platform, cache_key, _), result in zip(tasks, results):
+            if isinstance(result, BaseException):
+                # Keep the failure-tolerant Kroger behavior; Amazon
+                # errors still surface as a 500 like before
+                if platform == "amazon":
+                    raise result
+                logger.error("Error searching %s: %s", platform, result)
+                continue
+            _search_cache_put(cache_key, result)
+            platform_results.append((platform, result))
+            logger.info("Found %d products from %s", len(result), platform)
+
+        # Price filters are pushed into the RapidAPI query above; filter
+        # client-side only when Kroger results (no upstream price filter)
+        # are in the mix
+        if request.filters and "kroger" in platforms_to_search:
+            price_lo = request.filters.price_min
+            price_hi = request.filters.price_max
+            if price_lo is not None or price_hi is not None:
+                platform_results = [
+                    (platform, [
+                        p for p in results
+                        if p.price
+                        and (price_lo is None or p.price >= price_lo)
+                        and (price_hi is None or p.price <= price_hi)
+                    ])
+                    for platform, results in platform_results
+                ]
+
+        total_results = sum(len(results) for _, results in platform_results)
+
+        # Amazon is already sorted upstream for price orderings; re-sort
+        # client-side only when merging platforms or sorting by rating
+        key = None
+        if request.sort_by and (len(platforms_to_search) > 1 or request.sort_by == "rating_desc"):
+            key, reverse = _SORT_KEYS.get(request.sort_by, (None, False))
+        if key:
+            # Each platform list is (made) sorted, then the runs are
+            # merged lazily in O(N) instead of concat + O(N log N) sort;
+            # islice stops the merge once the page is filled
+            runs = [
+                results
+                if platform == "amazon" and request.sort_by != "rating_desc"
+                else sorted(results, key=key, reverse=reverse)
+                for platform, results in platform_results
+            ]
+            merged = heapq.merge(*runs, key=key, reverse=reverse)
+            paginated_products = list(itertools.islice(merged, start_idx, end_idx))
+        else:
+            products = [p for _, results in platform_results for p in results]
+            paginated_products = products[start_idx:end_idx]
 
         response = SearchResponse(
             query=request.query,
-            total_results=len(products),
+            total_results=total_results,
             page=page,
             size=len(paginated_products),
             products=paginated_products,
         )
 
-        logger.info(f"Returning {len(paginated_products)} products (page {page})")
+        logger.info("Returning %d products (page %d)", len(paginated_products), page)
         return response
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error searching products: {str(e)}", exc_info=True)
+        logger.error("Error searching products: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error searching products: {str(e)}")
 
 
+@app.post("/admin/cache/clear")
+async def clear_search_cache():
+    """Drop all cached search results (manual invalidation)."""
+    cleared = len(_search_cache)
+    _search_cache.clear()
+    return {"cleared_entries": cleared}
+
+
 # Compatibility endpoint to accept orchestrator-style payload
 class OrchestratorRequirementSpec(BaseModel):
     product_type: str
@@ -248,7 +444,7 @@ async def search_products_orchestrator(payload: OrchestratorSearchRequest):
 
 
 @app.get("/api/v1/products/{product_id}", response_model=Product)
-async def get_product_details(product_id: str):
+async def get_product_details(product_id: str, request: Request, response: Response):
     """
     Get detailed product information by product ID (ASIN)
     """
@@ -259,7 +455,18 @@ async def get_product_details(product_id: str):
         # Extract ASIN from product_id (format: amazon_ASIN or just ASIN)
         asin = product_id.replace("amazon_", "") if product_id.startswith("amazon_") else product_id
 
-        logger.info(f"Fetching product details for ASIN: {asin}")
+        # Serve repeat polls from the cache: a matching ETag is a bare
+        # 304, a stale client still skips the upstream fetch
+        cached = _product_cache.get(asin)
+        if cached and cached[0] > time.monotonic():
+            _, etag, product = cached
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304)
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = "max-age=300"
+            return product
+
+        logger.info("Fetching product details for ASIN: %s", asin)
 
         # Get detailed product information
         details = await rapidapi_client.get_product_details(asin)
@@ -268,31 +475,17 @@ async def get_product_details(product_id: str):
             raise HTTPException(status_code=404, detail="Product not found")
 
         # Transform to Product model
-        price_str = details.get("product_price", "0")
-        price = None
-        try:
-            price = float(str(price_str).replace("$", "").replace(",", "").strip())
-        except Exception:
-            pass
-
-        rating = None
-        try:
-            rating = float(details.get("product_star_rating", "0"))
-        except Exception:
-            pass
+        price = _extract_number(details.get("product_price", "0"))
+        rating = _extract_number(details.get("product_star_rating", "0"))
+        review_count_val = _extract_number(details.get("product_num_ratings", "0"))
+        review_count = int(review_count_val) if review_count_val is not None else None
 
-        review_count = None
-        try:
-            review_count = int(details.get("product_num_ratings", "0"))
-        except Exception:
-            pass
-
-        availability = "out_of_stock"
         availability_text = details.get("product_availability", "")
-        if availability_text and any(
-            word in availability_text.lower() for word in ["in stock", "available", "order soon"]
-        ):
-            availability = "in_stock"
+        availability = (
+            "in_stock"
+            if availability_text and AVAIL_RE.search(availability_text)
+            else "out_of_stock"
+        )
 
         product = Product(
             id=f"amazon_{asin}",
@@ -313,12 +506,23 @@ async def get_product_details(product_id: str):
             url=details.get("product_url"),
         )
 
+        # Hash the raw payload once; identical upstream data yields the
+        # same ETag across workers and restarts
+        etag = hashlib.blake2b(orjson.dumps(details), digest_size=16).hexdigest()
+        while len(_product_cache) >= PRODUCT_CACHE_MAX:
+            _product_cache.pop(next(iter(_product_cache)))
+        _product_cache[asin] = (time.monotonic() + PRODUCT_CACHE_TTL, etag, product)
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "max-age=300"
         return product
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching product details: {str(e)}", exc_info=True)
+        logger.error("Error fetching product details: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching product details: {str(e)}")
 
 
@@ -340,11 +544,22 @@ async def get_product_reviews(product_id: str, page: int = 1):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching reviews: {str(e)}", exc_info=True)
+        logger.error("Error fetching reviews: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching reviews: {str(e)}")
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8002)
+    # One worker per core outside development (workers>1 needs the
+    # import-string form); uvloop/httptools ship with uvicorn[standard]
+    dev = os.environ.get("ENVIRONMENT", "development") == "development"
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8002,
+        workers=1 if dev else int(os.getenv("UVICORN_WORKERS", os.cpu_count() or 1)),
+        reload=dev,
+        loop="uvloop",
+        http="httptools",
+    )
@@ -1,13 +1,197 @@
+import asyncio
 import base64
 import logging
+import socket
+import time
 from typing import Any, Dict, List, Optional
 
 import aiohttp
+import orjson
+
+# aiodns backs aiohttp.AsyncResolver (aiohttp[speedups]); fall back to
+# the default threaded getaddrinfo resolver when it isn't installed
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
 
 from models.search import Product, ShippingInfo
 
 logger = logging.getLogger(__name__)
 
+# Process-wide fallback session: even if handlers construct several
+# KrogerAPIClient instances, they all share one connection pool and DNS
+# cache. DummyCookieJar because these are pure API calls and cookies
+# must not leak across requests.
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_session_lock = asyncio.Lock()
+
+
+async def _get_shared_session() -> aiohttp.ClientSession:
+    """Return the module-wide session, creating it once under a lock."""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        async with _shared_session_lock:
+            if _shared_session is None or _shared_session.closed:
+                _shared_session = aiohttp.ClientSession(
+                    json_serialize=lambda obj: orjson.dumps(obj).decode(),
+                    connector=aiohttp.TCPConnector(
+                        limit=100,
+                        limit_per_host=20,
+                        ttl_dns_cache=300,
+                        use_dns_cache=True,
+                        keepalive_timeout=75,
+                        family=socket.AF_INET,
+                        resolver=aiohttp.AsyncResolver() if aiodns else None,
+                    ),
+                    cookie_jar=aiohttp.DummyCookieJar(),
+                )
+    return _shared_session
+
+
+async def close_shared_session() -> None:
+    """Close the module-wide session (call from app shutdown)."""
+    global _shared_session
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
+
+# Zip code -> nearest locationId barely changes, yet resolving it cost a
+# full HTTPS round-trip per search. Cache per zip for a day; the lock
+# collapses concurrent lookups for the same zip into one request.
+ZIP_LOCATION_TTL = 86400.0
+_zip_location_cache: Dict[str, tuple] = {}
+_zip_location_lock = asyncio.Lock()
+
+# Storefront prefix for product links, concatenated once per item
+# instead of rebuilding the scheme+host per URL
+_KROGER_STORE_BASE = "https://www.kroger.com"
+
+# Image selection keys: min() with these runs the scan in CPython's C
+# loop instead of a Python for-loop per product
+_SIZE_PRIORITY = {"xlarge": 0, "large": 1, "medium": 2, "small": 3, "thumbnail": 4}
+
+
+def _img_key(img: Dict[str, Any]) -> tuple:
+    """Prefer featured images, then the front perspective."""
+    return (
+        0 if img.get("featured") else 1,
+        0 if img.get("perspective") == "front" else 1,
+    )
+
+
+def _size_key(size: Dict[str, Any]) -> int:
+    """Prefer the largest named size."""
+    return _SIZE_PRIORITY.get(size.get("size"), 99)
+
+
+class KrogerAPIError(Exception):
+    """Error response from the Kroger API, with its status and OAuth code."""
+
+    def __init__(self, status: Optional[int], code: str = "unknown", description: str = ""):
+        self.status = status
+        self.code = code
+        self.description = description
+        super().__init__(f"Kroger API error {status} ({code}): {description}")
+
+
+class _AsyncTokenBucket:
+    """
+    Token-bucket limiter smoothing outgoing calls under Kroger's quota.
+
+    A request that would blow the quota waits here instead of burning a
+    round-trip on a 429; responses can feed X-RateLimit-Remaining back
+    in to tighten the bucket when the server is running lower than our
+    local estimate.
+    """
+
+    def __init__(self, rate_per_sec: float = 10.0, burst: int = 20):
+        self._rate = rate_per_sec
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Take one token, sleeping until the bucket refills if empty."""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._burst, self._tokens + (now - self._last_refill) * self._rate
+            )
+            self._last_refill = now
+            if self._tokens < 1.0:
+                await asyncio.sleep((1.0 - self._tokens) / self._rate)
+                self._tokens = 1.0
+                self._last_refill = time.monotonic()
+            self._tokens -= 1.0
+
+    def note_headers(self, headers) -> None:
+        """Tighten the bucket when the server reports fewer remaining."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return
+        if remaining < self._tokens:
+            self._tokens = remaining
+
+
+class _Batcher:
+    """
+    Coalesce concurrent single-key lookups into one batched fetch.
+
+    Callers await get(key); pending keys are flushed to the process
+    callable either when the batch fills or after a short timeout, so N
+    concurrent lookups cost one upstream request.
+    """
+
+    def __init__(self, batch_size: int, timeout_ms: float, process):
+        self._batch_size = batch_size
+        self._timeout = timeout_ms / 1000.0
+        self._process = process
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self._batch_size:
+                self._flush()
+            elif self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_later())
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            asyncio.create_task(self._run(pending))
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._timeout)
+        self._flush_task = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            await self._run(pending)
+
+    async def _run(self, pending: Dict[str, asyncio.Future]) -> None:
+        try:
+            results = await self._process(list(pending))
+        except Exception as e:
+            logger.error(f"Batched fetch failed: {str(e)}")
+            results = {}
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(key))
+
 
 class KrogerAPIClient:
     """Client for Kroger Product API."""
@@ -15,74 +199,151 @@ class KrogerAPIClient:
     BASE_URL = "https://api.kroger.com/v1"
     TOKEN_URL = "https://api.kroger.com/v1/connect/oauth2/token"
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
         if not client_id or not client_secret:
             raise ValueError("Kroger Client ID and Client Secret are required")
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token: Optional[str] = None
         self.token_expires_at: Optional[float] = None
+        self._session = session
+        # The Basic Auth header and token request payload never change;
+        # build them once instead of re-encoding base64 per refresh
+        self._token_headers = {
+            "Authorization": "Basic "
+            + base64.b64encode(f"{client_id}:{client_secret}".encode()).decode(),
+            "Content-Type": "application/x-www-form-urlencoded",
+        }
+        self._token_data = {"grant_type": "client_credentials", "scope": "product.compact"}
+        self._token_lock = asyncio.Lock()
+        self._limiter = _AsyncTokenBucket(rate_per_sec=10, burst=20)
+        # Concurrent detail lookups coalesce into one /products call via
+        # filter.productId=id1,id2,...
+        self._detail_batcher = _Batcher(
+            batch_size=20, timeout_ms=25, process=self._fetch_product_batch
+        )
+
+    def attach_session(self, session: aiohttp.ClientSession) -> None:
+        """Use an externally owned session (e.g. the app-wide pool)."""
+        self._session = session
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the session for Kroger calls.
+
+        An explicitly attached session (the app-wide pool) wins;
+        otherwise all instances fall back to the module-wide shared
+        session, so connections to api.kroger.com stay keep-alive
+        across instances and everything after the first request skips
+        the TCP+TLS handshake and DNS lookup.
+        """
+        if self._session is not None and not self._session.closed:
+            return self._session
+        return await _get_shared_session()
+
+    async def close(self) -> None:
+        """
+        Close the attached session.
+
+        The module-wide fallback session is left alone; shut it down
+        via close_shared_session() from the app lifespan.
+        """
+        if (
+            self._session is not None
+            and self._session is not _shared_session
+            and not self._session.closed
+        ):
+            await self._session.close()
+
+    async def __aenter__(self) -> "KrogerAPIClient":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
 
     async def _get_access_token(self) -> str:
-        try:
-            credentials = f"{self.client_id}:{self.client_secret}"
-            encoded_credentials = base64.b64encode(credentials.encode()).decode()
+        session = await self._get_session()
+        async with session.post(
+            self.TOKEN_URL,
+            headers=self._token_headers,
+            data=self._token_data,
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as response:
+            if response.status != 200:
+                # Read the body exactly once: a second read on the
+                # same response raises, which used to swallow the
+                # structured OAuth error below
+                body = await response.read()
+                error_text = body.decode("utf-8", "replace")
+                logger.error(f"Kroger token error: {response.status} - {error_text}")
+                self.access_token = None
+                self.token_expires_at = None
 
-            headers = {
-                "Authorization": f"Basic {encoded_credentials}",
-                "Content-Type": "application/x-www-form-urlencoded",
-            }
+                try:
+                    error_json = orjson.loads(body)
+                except orjson.JSONDecodeError:
+                    raise KrogerAPIError(response.status, description=error_text)
+
+                raise KrogerAPIError(
+                    response.status,
+                    code=error_json.get("error", "unknown"),
+                    description=error_json.get("error_description", error_text),
+                )
 
-            data = {"grant_type": "client_credentials", "scope": "product.compact"}
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.TOKEN_URL,
-                    headers=headers,
-                    data=data,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Kroger token error: {response.status} - {error_text}")
-
-                        try:
-                            error_json = await response.json()
-                            error_code = error_json.get("error", "unknown")
-                            error_description = error_json.get("error_description", error_text)
-                            logger.error(f"Kroger OAuth error: {error_code} - {error_description}")
-                            self.access_token = None
-                            self.token_expires_at = None
-                            raise Exception(f"Kroger OAuth error ({error_code}): {error_description}")
-                        except Exception:
-                            self.access_token = None
-                            self.token_expires_at = None
-                            raise Exception(f"Failed to get Kroger access token: {response.status} - {error_text}")
-
-                    token_data = await response.json()
-                    self.access_token = token_data.get("access_token")
-                    expires_in = token_data.get("expires_in", 3600)
-
-                    import time
-
-                    self.token_expires_at = time.time() + expires_in - 60
-                    logger.info("Successfully obtained Kroger access token")
-                    return self.access_token
+            token_data = orjson.loads(await response.read())
+            self.access_token = token_data.get("access_token")
+            expires_in = token_data.get("expires_in", 3600)
 
-        except Exception as e:
-            logger.error(f"Error getting Kroger access token: {str(e)}")
-            raise
+            self.token_expires_at = time.time() + expires_in - 60
+            logger.info("Successfully obtained Kroger access token")
+            return self.access_token
 
     async def _ensure_token(self) -> str:
-        import time
-
-        if not self.access_token or (self.token_expires_at and time.time() >= self.token_expires_at):
+        # Fast path without the lock; on expiry, serialize the refresh so
+        # N concurrent callers produce one OAuth POST instead of N
+        if self.access_token and (
+            not self.token_expires_at or time.time() < self.token_expires_at
+        ):
+            return self.access_token
+
+        async with self._token_lock:
+            if self.access_token and (
+                not self.token_expires_at or time.time() < self.token_expires_at
+            ):
+                return self.access_token
             self.access_token = None
             self.token_expires_at = None
             await self._get_access_token()
 
         return self.access_token
 
+    async def _resolve_location(self, zip_code: str) -> Optional[str]:
+        """Resolve a zip code to the nearest locationId, cached for a day."""
+        entry = _zip_location_cache.get(zip_code)
+        if entry is not None and time.time() < entry[1]:
+            return entry[0]
+
+        async with _zip_location_lock:
+            entry = _zip_location_cache.get(zip_code)
+            if entry is not None and time.time() < entry[1]:
+                return entry[0]
+            try:
+                locations = await self.get_locations(zip_code=zip_code)
+            except Exception as e:
+                logger.warning(f"Could not get location for zip code {zip_code}: {str(e)}")
+                return None
+            location_id = locations[0].get("locationId") if locations else None
+            if location_id:
+                _zip_location_cache[zip_code] = (location_id, time.time() + ZIP_LOCATION_TTL)
+                logger.info(f"Using location_id {location_id} for zip code {zip_code}")
+            return location_id
+
     async def search_products(
         self,
         query: str,
@@ -92,79 +353,135 @@ class KrogerAPIClient:
         zip_code: Optional[str] = None,
     ) -> List[Product]:
         try:
-            await self._ensure_token()
+            # On a cold start the token refresh and the zip lookup are
+            # two independent round-trips; run them concurrently. The
+            # token lock makes the lookup's own _ensure_token wait on
+            # the same refresh instead of issuing a second OAuth POST.
+            if not location_id and zip_code:
+                _, location_id = await asyncio.gather(
+                    self._ensure_token(), self._resolve_location(zip_code)
+                )
+            else:
+                await self._ensure_token()
 
             url = f"{self.BASE_URL}/products"
+            # aiohttp URL-encodes ints directly; skip the str() churn
             params: Dict[str, Any] = {
                 "filter.term": query,
-                "filter.limit": str(min(limit, 50)),
-                "filter.start": str(start),
+                "filter.limit": min(limit, 50),
+                "filter.start": start,
             }
 
             if location_id:
                 params["filter.locationId"] = location_id
-            elif zip_code:
-                try:
-                    locations = await self.get_locations(zip_code=zip_code)
-                    if locations and len(locations) > 0:
-                        location_id = locations[0].get("locationId")
-                        if location_id:
-                            params["filter.locationId"] = location_id
-                            logger.info(f"Using location_id {location_id} for zip code {zip_code}")
-                except Exception as e:
-                    logger.warning(f"Could not get location for zip code {zip_code}: {str(e)}")
 
-            headers = {"Authorization": f"Bearer {self.access_token}", "Accept": "application/json"}
+            headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, br",
+            }
 
             logger.info(f"Calling Kroger API: query='{query}', limit={limit}")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Kroger API error: {response.status} - {error_text}")
-                        raise Exception(f"Kroger API returned status {response.status}: {error_text}")
-
-                    data = await response.json()
+            await self._limiter.acquire()
+            session = await self._get_session()
+            async with session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=15),
+            ) as response:
+                self._limiter.note_headers(response.headers)
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Kroger API error: {response.status} - {error_text}")
+                    raise KrogerAPIError(response.status, description=error_text)
+
+                data = orjson.loads(await response.read())
+                # Large transforms run off the event loop so parallel
+                # platform searches keep progressing; small ones aren't
+                # worth the thread hop
+                if len(data.get("data", [])) > 10:
+                    products = await asyncio.to_thread(
+                        self._transform_kroger_response, data
+                    )
+                else:
                     products = self._transform_kroger_response(data)
-                    logger.info(f"Successfully fetched {len(products)} products from Kroger")
-                    return products
+                logger.info(f"Successfully fetched {len(products)} products from Kroger")
+                return products
 
         except aiohttp.ClientError as e:
             logger.error(f"Network error calling Kroger API: {str(e)}")
-            raise Exception(f"Network error: {str(e)}")
-        except Exception as e:
-            logger.error(f"Error searching products from Kroger: {str(e)}")
-            raise
+            raise KrogerAPIError(None, code="network_error", description=str(e))
+
+    async def _fetch_product_batch(self, product_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch a batch of products in one /products call, keyed by id."""
+        await self._ensure_token()
+
+        url = f"{self.BASE_URL}/products"
+        params = {"filter.productId": ",".join(product_ids)}
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, br",
+        }
+
+        await self._limiter.acquire()
+        session = await self._get_session()
+        async with session.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as response:
+            self._limiter.note_headers(response.headers)
+            if response.status != 200:
+                logger.error(f"Kroger product batch error: {response.status}")
+                # Drop the body so the connection goes back to the pool
+                await response.release()
+                return {}
+
+            data = orjson.loads(await response.read())
+            return {item.get("productId"): item for item in data.get("data", [])}
 
     async def get_product_details(self, product_id: str, location_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the bare product item dict, or None if unavailable."""
+        # Location-less lookups go through the batcher so concurrent
+        # fan-outs share one upstream request; a location_id pins
+        # store-specific pricing and is fetched directly
+        if not location_id:
+            return await self._detail_batcher.get(product_id)
+
         try:
             await self._ensure_token()
 
             url = f"{self.BASE_URL}/products/{product_id}"
-            params: Dict[str, Any] = {}
-            if location_id:
-                params["filter.locationId"] = location_id
-
-            headers = {"Authorization": f"Bearer {self.access_token}", "Accept": "application/json"}
+            params: Dict[str, Any] = {"filter.locationId": location_id}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"Kroger product details error: {response.status}")
-                        return None
+            headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, br",
+            }
 
-                    return await response.json()
+            await self._limiter.acquire()
+            session = await self._get_session()
+            async with session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as response:
+                self._limiter.note_headers(response.headers)
+                if response.status != 200:
+                    logger.error(f"Kroger product details error: {response.status}")
+                    await response.release()
+                    return None
+
+                # Unwrap the {"data": {...}} envelope so both paths
+                # return the same bare item shape as the batcher
+                data = orjson.loads(await response.read())
+                return data.get("data") or None
 
         except Exception as e:
             logger.error(f"Error fetching Kroger product details: {str(e)}")
@@ -175,22 +492,29 @@ class KrogerAPIClient:
             await self._ensure_token()
 
             url = f"{self.BASE_URL}/locations"
-            params = {"filter.zipCode.near": zip_code, "filter.limit": "5"}
-            headers = {"Authorization": f"Bearer {self.access_token}", "Accept": "application/json"}
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"Kroger locations error: {response.status}")
-                        return None
-
-                    data = await response.json()
-                    return data.get("data", [])
+            params = {"filter.zipCode.near": zip_code, "filter.limit": 5}
+            headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, br",
+            }
+
+            await self._limiter.acquire()
+            session = await self._get_session()
+            async with session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as response:
+                self._limiter.note_headers(response.headers)
+                if response.status != 200:
+                    logger.error(f"Kroger locations error: {response.status}")
+                    await response.release()
+                    return None
+
+                data = orjson.loads(await response.read())
+                return data.get("data", [])
 
         except Exception as e:
             logger.error(f"Error fetching Kroger locations: {str(e)}")
@@ -198,28 +522,55 @@ class KrogerAPIClient:
 
     def _transform_kroger_response(self, data: Dict[str, Any]) -> List[Product]:
         products: List[Product] = []
-        items = data.get("data", [])
 
-        for item in items:
+        for item in data.get("data", []):
             try:
                 product_id = item.get("productId")
                 if not product_id:
                     continue
 
+                # One extraction per item: price, currency, and
+                # availability all come off the same head entry
                 price = None
                 currency = "USD"
-                if item.get("items"):
-                    first_item = item["items"][0]
-                    if first_item.get("price"):
-                        price = first_item["price"].get("regular")
-                        currency = first_item["price"].get("currency", "USD")
+                availability = "out_of_stock"
+                item_entries = item.get("items")
+                if item_entries:
+                    first = item_entries[0]
+                    price_info = first.get("price")
+                    if price_info:
+                        regular = price_info.get("regular")
+                        if regular is not None:
+                            # Kroger sometimes sends the price as a
+                            # string; model_construct won't coerce it
+                            try:
+                                price = float(regular)
+                            except (TypeError, ValueError):
+                                pass
+                        currency = price_info.get("currency", "USD")
+                    inventory = first.get("inventory")
+                    if inventory is None or inventory.get("stockLevel") != "OUT_OF_STOCK":
+                        availability = "in_stock"
 
-                availability = "in_stock" if item.get("items") else "out_of_stock"
                 image_url = None
-                if item.get("images"):
-                    image_url = item["images"][0].get("sizes", [{}])[0].get("url")
-
-                product = Product(
+                images = item.get("images")
+                if images:
+                    sizes = min(images, key=_img_key).get("sizes")
+                    if sizes:
+                        image_url = min(sizes, key=_size_key).get("url")
+
+                page_uri = item.get("productPageURI")
+                if page_uri:
+                    product_url = _KROGER_STORE_BASE + (
+                        page_uri if page_uri.startswith("/") else "/" + page_uri
+                    )
+                else:
+                    upc = item.get("upc")
+                    product_url = f"{_KROGER_STORE_BASE}/p/{upc}" if upc else None
+
+                # Transform-only call site with every field supplied
+                # explicitly, so model_construct can skip validation
+                product = Product.model_construct(
                     id=f"kroger_{product_id}",
                     title=item.get("description"),
                     brand=item.get("brand"),
@@ -232,7 +583,7 @@ class KrogerAPIClient:
                     image_url=image_url,
                     availability=availability,
                     shipping_info=None,
-                    url=None,
+                    url=product_url,
                 )
                 products.append(product)
 
@@ -1,12 +1,113 @@
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import re
+import socket
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
+import orjson
+from yarl import URL
+
+# Optional: stream-parse large search responses instead of buffering them
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: resolve DNS on the event loop instead of the threadpool
+try:
+    import aiodns
+except ImportError:
+    aiodns = None
 
 from models.search import Product, ShippingInfo
 
 logger = logging.getLogger(__name__)
 
+# Compiled once: _transform_item runs per product in the search hot loop,
+# and regex/tuple lookups beat chained str.replace and `or` fallbacks there
+# Single-pass C-level delete of currency noise, vs. chained replace()
+# allocating an intermediate string per character class
+_PRICE_TRANS = str.maketrans("", "", "$, \t")
+_FLOAT_RE = re.compile(r"\d+(?:\.\d+)?")
+_INT_RE = re.compile(r"\d+")
+_AVAIL_RE = re.compile(r"in stock|available|order soon", re.I)
+_PRICE_KEYS = ("product_price", "price", "sale_price")
+_RATING_KEYS = ("product_star_rating", "star_rating", "rating")
+_RCOUNT_KEYS = ("product_num_ratings", "num_ratings", "review_count")
+_AVAIL_KEYS = ("product_availability", "availability")
+_TITLE_KEYS = ("product_title", "title")
+_BRAND_KEYS = ("product_brand", "brand")
+_URL_KEYS = ("product_url", "url")
+
+
+def _first(item: Dict[str, Any], keys: tuple) -> Any:
+    """Return the first non-None value among ``keys``."""
+    for key in keys:
+        value = item.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+class _AIMDConcurrency:
+    """
+    Additive-increase/multiplicative-decrease concurrency gate.
+
+    The permitted fan-out creeps up by ``alpha`` per healthy response
+    while observed latency stays under ``latency_target``, and halves on
+    429/5xx, so the client sits near the RapidAPI quota ceiling without
+    repeatedly tripping it.
+    """
+
+    def __init__(
+        self,
+        limit: int = 8,
+        floor: int = 1,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        latency_target: float = 2.0,
+    ):
+        self._ceiling = limit
+        self._floor = floor
+        self._alpha = alpha
+        self._beta = beta
+        self._latency_target = latency_target
+        self._limit = float(limit)
+        self._active = 0
+        self._cond = asyncio.Condition()
+        self._latencies: deque = deque(maxlen=32)
+
+    async def __aenter__(self) -> "_AIMDConcurrency":
+        async with self._cond:
+            while self._active >= int(self._limit):
+                await self._cond.wait()
+            self._active += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        async with self._cond:
+            self._active -= 1
+            # Waiters re-check the (possibly raised) limit on each
+            # release, so additive increases take effect here
+            self._cond.notify()
+
+    def record_success(self, latency: float) -> None:
+        self._latencies.append(latency)
+        mean = sum(self._latencies) / len(self._latencies)
+        if mean <= self._latency_target and self._limit < self._ceiling:
+            self._limit = min(float(self._ceiling), self._limit + self._alpha)
+
+    def record_backoff(self) -> None:
+        # Stale latency samples would immediately argue for raising the
+        # limit again, so drop them along with halving it
+        self._latencies.clear()
+        self._limit = max(float(self._floor), self._limit * self._beta)
+
 
 class RapidAPIAmazonClient:
     """Client for RapidAPI Amazon Product API."""
@@ -14,14 +115,163 @@ class RapidAPIAmazonClient:
     BASE_URL = "https://real-time-amazon-data.p.rapidapi.com"
     RAPIDAPI_HOST = "real-time-amazon-data.p.rapidapi.com"
 
-    def __init__(self, api_key: str):
+    # One ClientTimeout for every call instead of a fresh instance per
+    # request; aiohttp treats it as immutable
+    _TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+    # Pre-parsed endpoint URLs: handing aiohttp a yarl.URL skips the
+    # per-request str->URL parse (the shared app session serves several
+    # hosts, so a session-level base_url isn't an option)
+    _SEARCH_URL = URL(BASE_URL + "/search")
+    _DETAILS_URL = URL(BASE_URL + "/product-details")
+    _REVIEWS_URL = URL(BASE_URL + "/product-reviews")
+
+    # Provider cap on comma-joined ASINs per /product-details call
+    _BATCH_SIZE = 10
+
+    # ijson event prefixes where a streamed search item can start;
+    # "data.item" covers responses whose "data" is a bare product list
+    _ITEM_PREFIXES = frozenset(
+        f"data.{key}.item" for key in ("products", "results", "items")
+    ) | {"data.item"}
+
+    # Container keys whose appearance means "data" holds a product list
+    # rather than a single product object
+    _CONTAINER_PREFIXES = frozenset(
+        f"data.{key}" for key in ("products", "results", "items")
+    )
+
+    # Frozen templates for the params that rarely deviate from their
+    # defaults: copying a template beats rebuilding 7-9 literal entries
+    # per call, and only deviating keys are overlaid
+    _SEARCH_DEFAULTS = MappingProxyType({
+        "country": "US",
+        "sort_by": "RELEVANCE",
+        "product_condition": "ALL",
+        "is_prime": "false",
+        "deals_and_discounts": "NONE",
+    })
+    _REVIEWS_DEFAULTS = MappingProxyType({
+        "country": "US",
+        "page": "1",
+        "sort_by": "TOP_REVIEWS",
+        "star_rating": "ALL",
+        "verified_purchases_only": "false",
+        "images_or_videos_only": "false",
+        "current_format_only": "false",
+    })
+
+    def __init__(self, api_key: str, session: Optional[aiohttp.ClientSession] = None):
         if not api_key:
             raise ValueError("RapidAPI key is required")
         self.api_key = api_key
-        self.headers = {
+        # Read-only view: the same dict is handed to aiohttp on every
+        # call, so accidental mutation would leak across requests
+        self.headers = MappingProxyType({
             "x-rapidapi-host": self.RAPIDAPI_HOST,
             "x-rapidapi-key": self.api_key,
-        }
+        })
+        self._session = session
+        # True only for sessions this client created itself; attached
+        # or constructor-passed sessions belong to the caller
+        self._owns_session = False
+        # Bounds the detail-enrichment fan-out so a page of results
+        # doesn't open enough concurrent calls to draw RapidAPI 429s,
+        # and adapts the bound to observed 429s/latency
+        self._limiter = _AIMDConcurrency(limit=8)
+        # LRU of futures: repeat lookups hit memory instead of RapidAPI,
+        # and concurrent lookups for the same key await one in-flight
+        # request instead of issuing duplicates
+        self._details_cache: "OrderedDict[tuple, asyncio.Future]" = OrderedDict()
+        self._reviews_cache: "OrderedDict[tuple, asyncio.Future]" = OrderedDict()
+        self._cache_max = 1024
+
+    def attach_session(self, session: aiohttp.ClientSession) -> None:
+        """Use an externally owned session (e.g. the app-wide pool)."""
+        self._session = session
+        self._owns_session = False
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared session, creating a pooled one if none was attached.
+
+        Reusing one session keeps connections to the RapidAPI host alive,
+        so requests skip the TCP+TLS handshake after the first.
+        """
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=30,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                    # RapidAPI is IPv4-only; skipping AAAA halves lookups
+                    family=socket.AF_INET,
+                    resolver=aiohttp.AsyncResolver() if aiodns else None,
+                )
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """Close the owned session (no-op for attached external sessions)."""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> "RapidAPIAmazonClient":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def _request(self, url: URL, params: Dict[str, str]):
+        """
+        GET an endpoint with 429/Retry-After handling and AIMD feedback.
+
+        Yields the open response so callers can stream or buffer the body
+        themselves. 429 and 5xx responses are retried up to three attempts
+        with exponential backoff (honouring Retry-After when present), and
+        every outcome feeds the concurrency gate.
+        """
+        session = await self._get_session()
+        for attempt in range(3):
+            start = time.monotonic()
+            async with session.get(
+                url,
+                params=params,
+                headers=self.headers,
+                timeout=self._TIMEOUT,
+            ) as response:
+                if response.status == 429 or response.status >= 500:
+                    self._limiter.record_backoff()
+                    if attempt < 2:
+                        retry_after = response.headers.get("Retry-After")
+                        await response.release()
+                        try:
+                            delay = float(retry_after)
+                        except (TypeError, ValueError):
+                            delay = 0.5 * (2 ** attempt)
+                        logger.warning(
+                            f"RapidAPI {url.path} returned {response.status}, retrying in {delay:.1f}s"
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+                elif response.status == 200:
+                    self._limiter.record_success(time.monotonic() - start)
+                    # Throttle proactively when the monthly quota is
+                    # nearly spent, not just when 429s start arriving
+                    remaining = response.headers.get("x-ratelimit-requests-remaining")
+                    quota = response.headers.get("x-ratelimit-requests-limit")
+                    if remaining is not None and quota is not None:
+                        try:
+                            if float(remaining) < float(quota) * 0.1:
+                                self._limiter.record_backoff()
+                        except ValueError:
+                            pass
+                yield response
+                return
 
     async def search_products(
         self,
@@ -32,42 +282,25 @@ class RapidAPIAmazonClient:
         product_condition: str = "ALL",
         is_prime: bool = False,
         deals_and_discounts: str = "NONE",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        max_items: Optional[int] = None,
     ) -> List[Product]:
         try:
-            url = f"{self.BASE_URL}/search"
-            params = {
-                "query": query,
-                "page": str(page),
-                "country": country,
-                "sort_by": sort_by,
-                "product_condition": product_condition,
-                "is_prime": "true" if is_prime else "false",
-                "deals_and_discounts": deals_and_discounts,
-            }
-
+            params = self._search_params(
+                query, page, country, sort_by, product_condition,
+                is_prime, deals_and_discounts, min_price, max_price,
+            )
             logger.info(f"Calling RapidAPI search: query='{query}', page={page}")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"RapidAPI search error: {response.status} - {error_text}")
-                        raise Exception(f"RapidAPI returned status {response.status}: {error_text}")
-
-                    data = await response.json()
-
-                    if data.get("status") != "OK":
-                        error_msg = data.get("message", "Unknown error")
-                        raise Exception(f"RapidAPI error: {error_msg}")
-
-                    products = self._transform_search_response(data)
-                    logger.info(f"Successfully fetched {len(products)} products from RapidAPI")
-                    return products
+            if ijson is not None:
+                products = [p async for p in self._stream_search(params, max_items)]
+                if not products:
+                    logger.warning("RapidAPI search returned no products")
+            else:
+                products = await self._search_buffered(params, max_items)
+            logger.info(f"Successfully fetched {len(products)} products from RapidAPI")
+            return products
 
         except aiohttp.ClientError as e:
             logger.error(f"Network error calling RapidAPI: {str(e)}")
@@ -76,29 +309,361 @@ class RapidAPIAmazonClient:
             logger.error(f"Error searching products: {str(e)}")
             raise
 
+    async def stream_products(
+        self,
+        query: str,
+        page: int = 1,
+        country: str = "US",
+        sort_by: str = "RELEVANCE",
+        product_condition: str = "ALL",
+        is_prime: bool = False,
+        deals_and_discounts: str = "NONE",
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        max_items: Optional[int] = None,
+    ) -> AsyncIterator[Product]:
+        """
+        Yield products as they parse off the wire.
+
+        Lets callers start follow-up work (detail fetches, scoring) while
+        the rest of the search body is still downloading. Without ijson
+        the whole body is buffered first, then yielded.
+        """
+        params = self._search_params(
+            query, page, country, sort_by, product_condition,
+            is_prime, deals_and_discounts, min_price, max_price,
+        )
+        if ijson is None:
+            for product in await self._search_buffered(params, max_items):
+                yield product
+            return
+        async for product in self._stream_search(params, max_items):
+            yield product
+
+    def _search_params(
+        self,
+        query: str,
+        page: int,
+        country: str,
+        sort_by: str,
+        product_condition: str,
+        is_prime: bool,
+        deals_and_discounts: str,
+        min_price: Optional[float],
+        max_price: Optional[float],
+    ) -> Dict[str, str]:
+        params = {**self._SEARCH_DEFAULTS, "query": query, "page": str(page)}
+        if country != "US":
+            params["country"] = country
+        if sort_by != "RELEVANCE":
+            params["sort_by"] = sort_by
+        if product_condition != "ALL":
+            params["product_condition"] = product_condition
+        if is_prime:
+            params["is_prime"] = "true"
+        if deals_and_discounts != "NONE":
+            params["deals_and_discounts"] = deals_and_discounts
+        # Filter upstream so filtered-out items are never transferred
+        # or parsed
+        if min_price is not None:
+            params["min_price"] = str(min_price)
+        if max_price is not None:
+            params["max_price"] = str(max_price)
+        return params
+
+    async def _stream_search(
+        self, params: Dict[str, str], max_items: Optional[int]
+    ) -> AsyncIterator[Product]:
+        async with self._request(self._SEARCH_URL, params) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"RapidAPI search error: {response.status} - {error_text}")
+                raise Exception(f"RapidAPI returned status {response.status}: {error_text}")
+
+            # Stream parse events instead of buffering the whole
+            # 100-500kB body: only one product item is ever resident,
+            # the envelope is never built, and the same shapes the
+            # buffered path parses are recognised: a container key
+            # (products/results/items), a bare product list, or a
+            # single product object as "data". Raw events also expose
+            # the top-level status/message fields, so an HTTP-200
+            # error envelope still raises like the buffered path.
+            count = 0
+            status_value = None
+            error_msg = None
+            builder = None
+            item_prefix = None
+            # Tentative buffer for the single-product-object shape;
+            # dropped as soon as a known container key appears
+            data_builder = None
+            async for prefix, event, value in ijson.parse_async(response.content):
+                if builder is not None:
+                    builder.event(event, value)
+                    if event == "end_map" and prefix == item_prefix:
+                        item = builder.value
+                        builder = None
+                        product = self._transform_item(item)
+                        if product is not None:
+                            yield product
+                            count += 1
+                            if max_items is not None and count >= max_items:
+                                return
+                    continue
+                if event == "start_map" and prefix in self._ITEM_PREFIXES:
+                    data_builder = None
+                    item_prefix = prefix
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    continue
+                if data_builder is not None:
+                    if event == "start_array" and prefix in self._CONTAINER_PREFIXES:
+                        data_builder = None
+                        continue
+                    data_builder.event(event, value)
+                    if event == "end_map" and prefix == "data":
+                        item = data_builder.value
+                        data_builder = None
+                        if isinstance(item, dict) and item:
+                            product = self._transform_item(item)
+                            if product is not None:
+                                yield product
+                                count += 1
+                                if max_items is not None and count >= max_items:
+                                    return
+                    continue
+                if event == "start_map" and prefix == "data":
+                    data_builder = ijson.ObjectBuilder()
+                    data_builder.event(event, value)
+                elif prefix == "status":
+                    status_value = value
+                elif prefix == "message":
+                    error_msg = value
+            if status_value is not None and status_value != "OK":
+                raise Exception(f"RapidAPI error: {error_msg or 'Unknown error'}")
+
+    async def _search_buffered(
+        self, params: Dict[str, str], max_items: Optional[int]
+    ) -> List[Product]:
+        async with self._request(self._SEARCH_URL, params) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"RapidAPI search error: {response.status} - {error_text}")
+                raise Exception(f"RapidAPI returned status {response.status}: {error_text}")
+
+            # orjson.loads on the raw bytes: 2-5x faster than the
+            # stdlib decoder on these nested payloads, and immune to
+            # RapidAPI's occasional text/json content type
+            data = orjson.loads(await response.read())
+
+            if data.get("status") != "OK":
+                error_msg = data.get("message", "Unknown error")
+                raise Exception(f"RapidAPI error: {error_msg}")
+
+            products = self._transform_search_response(data)
+            if max_items is not None:
+                products = products[:max_items]
+            return products
+
+    async def search_with_details(
+        self,
+        query: str,
+        page: int = 1,
+        country: str = "US",
+        max_details: int = 10,
+        include_reviews: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search and enrich the top results with product details.
+
+        Details come from one batched /product-details call per ten
+        ASINs instead of a call per product, and enrichment starts while
+        the search body is still downloading: ASINs stream off the wire,
+        so each detail batch (and each review fetch) is fired as soon as
+        its ASINs have parsed. Reviews (no batch endpoint) fan out
+        concurrently under the AIMD gate. Enrichment failures fall back
+        to the bare search result so ordering and count are preserved.
+        """
+        reviews_map: Dict[str, List[Dict[str, Any]]] = {}
+
+        async def _reviews(asin: str) -> None:
+            try:
+                async with self._limiter:
+                    reviews_map[asin] = await self.get_product_reviews(asin, country=country) or []
+            except Exception as e:
+                logger.warning(f"Review fetch failed for {asin}: {str(e)}")
+                reviews_map[asin] = []
+
+        products: List[Product] = []
+        pending_asins: List[str] = []
+        batch_tasks: List[asyncio.Task] = []
+        review_tasks: List[asyncio.Task] = []
+        async for product in self.stream_products(query=query, page=page, country=country):
+            products.append(product)
+            if len(products) <= max_details:
+                pending_asins.append(product.platform_id)
+                if include_reviews:
+                    review_tasks.append(asyncio.create_task(_reviews(product.platform_id)))
+                if len(pending_asins) >= self._BATCH_SIZE:
+                    batch_tasks.append(asyncio.create_task(
+                        self.get_products_details_batch(pending_asins, country=country)
+                    ))
+                    pending_asins = []
+        if pending_asins:
+            batch_tasks.append(asyncio.create_task(
+                self.get_products_details_batch(pending_asins, country=country)
+            ))
+
+        details_map: Dict[str, Dict[str, Any]] = {}
+        for batch in await asyncio.gather(*batch_tasks, return_exceptions=True):
+            if isinstance(batch, BaseException):
+                # Degrade to un-enriched results rather than failing
+                # the whole search
+                logger.warning(f"Detail batch failed: {str(batch)}")
+                continue
+            details_map.update(batch)
+        if review_tasks:
+            await asyncio.gather(*review_tasks)
+        head = products[:max_details]
+
+        results: List[Dict[str, Any]] = []
+        for product in head:
+            base = product.model_dump()
+            details = details_map.get(product.platform_id)
+            if details:
+                base["details"] = details
+            if include_reviews:
+                base["reviews"] = reviews_map.get(product.platform_id, [])
+            results.append(base)
+        results.extend(product.model_dump() for product in products[max_details:])
+        return results
+
+    async def get_products_details_batch(
+        self, asins: List[str], country: str = "US"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch details for many ASINs, comma-joined ten per request.
+
+        Returns a dict keyed by ASIN; ASINs the provider didn't return
+        are simply absent. Falls back to concurrent per-ASIN lookups
+        (which hit the LRU) for any chunk the batch form can't serve.
+        """
+        details: Dict[str, Dict[str, Any]] = {}
+        fallback: List[str] = []
+        for start in range(0, len(asins), self._BATCH_SIZE):
+            chunk = asins[start:start + self._BATCH_SIZE]
+            if len(chunk) == 1:
+                # No savings batching a single ASIN, and the per-ASIN
+                # path is the one backed by the LRU
+                fallback.extend(chunk)
+                continue
+            params = {"asin": ",".join(chunk), "country": country}
+            try:
+                async with self._request(self._DETAILS_URL, params) as response:
+                    if response.status != 200:
+                        logger.warning(
+                            f"Batch product-details returned {response.status}, "
+                            f"falling back to per-ASIN calls"
+                        )
+                        await response.release()
+                        fallback.extend(chunk)
+                        continue
+                    data = orjson.loads(await response.read())
+            # Broad on purpose: total-timeout raises asyncio.TimeoutError
+            # (not a ClientError on aiohttp 3.9) and a malformed body
+            # raises orjson.JSONDecodeError; either way the chunk should
+            # fall back, not fail the caller
+            except Exception as e:
+                logger.warning(f"Batch product-details failed: {str(e)}")
+                fallback.extend(chunk)
+                continue
+            if data.get("status") != "OK":
+                fallback.extend(chunk)
+                continue
+            payload = data.get("data") or []
+            if isinstance(payload, dict):
+                # A single-product shape means the provider ignored the
+                # comma-joined list; don't trust it for the whole chunk
+                payload = payload.get("products") or []
+            seen = set()
+            for entry in payload:
+                asin = entry.get("asin")
+                if asin:
+                    details[asin] = entry
+                    seen.add(asin)
+            fallback.extend(asin for asin in chunk if asin not in seen)
+
+        if fallback:
+            fetched = await asyncio.gather(
+                *(self.get_product_details(asin, country=country) for asin in fallback),
+                return_exceptions=True,
+            )
+            for asin, result in zip(fallback, fetched):
+                if isinstance(result, dict):
+                    details[asin] = result
+        return details
+
+    async def _cached(self, cache: "OrderedDict[tuple, asyncio.Future]", key: tuple, fetch):
+        """
+        Resolve ``key`` through an LRU of futures, fetching on miss.
+
+        Failed fetches (None results) are evicted immediately so the next
+        caller retries instead of pinning the failure for the cache's life.
+        """
+        future = cache.get(key)
+        if future is not None:
+            cache.move_to_end(key)
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().create_future()
+        cache[key] = future
+        if len(cache) > self._cache_max:
+            cache.popitem(last=False)
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            # Only genuine cancellation cancels the waiters; they are
+            # shielded from their own callers' cancellation, not ours
+            cache.pop(key, None)
+            if not future.done():
+                future.cancel()
+            raise
+        except Exception as e:
+            # Hand waiters the real error instead of a CancelledError
+            # that would sail past their except Exception guards
+            cache.pop(key, None)
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so the loop doesn't warn when no
+                # waiter is attached
+                future.exception()
+            raise
+        future.set_result(result)
+        if result is None:
+            cache.pop(key, None)
+        return result
+
     async def get_product_details(self, asin: str, country: str = "US") -> Optional[Dict[str, Any]]:
+        return await self._cached(
+            self._details_cache,
+            (asin, country),
+            lambda: self._fetch_product_details(asin, country),
+        )
+
+    async def _fetch_product_details(self, asin: str, country: str = "US") -> Optional[Dict[str, Any]]:
         try:
-            url = f"{self.BASE_URL}/product-details"
             params = {"asin": asin, "country": country}
 
             logger.info(f"Fetching product details for ASIN: {asin}")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"RapidAPI product-details error: {response.status}")
-                        return None
+            async with self._request(self._DETAILS_URL, params) as response:
+                if response.status != 200:
+                    logger.error(f"RapidAPI product-details error: {response.status}")
+                    return None
 
-                    data = await response.json()
-                    if data.get("status") != "OK":
-                        return None
+                data = orjson.loads(await response.read())
+                if data.get("status") != "OK":
+                    return None
 
-                    return data.get("data", {})
+                return data.get("data", {})
 
         except Exception as e:
             logger.error(f"Error fetching product details: {str(e)}")
@@ -112,34 +677,40 @@ class RapidAPIAmazonClient:
         sort_by: str = "TOP_REVIEWS",
         star_rating: str = "ALL",
     ) -> Optional[List[Dict[str, Any]]]:
-        try:
-            url = f"{self.BASE_URL}/product-reviews"
-            params = {
-                "asin": asin,
-                "country": country,
-                "page": str(page),
-                "sort_by": sort_by,
-                "star_rating": star_rating,
-                "verified_purchases_only": "false",
-                "images_or_videos_only": "false",
-                "current_format_only": "false",
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    params=params,
-                    headers=self.headers,
-                    timeout=aiohttp.ClientTimeout(total=15),
-                ) as response:
-                    if response.status != 200:
-                        return None
+        return await self._cached(
+            self._reviews_cache,
+            (asin, country, page, sort_by, star_rating),
+            lambda: self._fetch_product_reviews(asin, country, page, sort_by, star_rating),
+        )
 
-                    data = await response.json()
-                    if data.get("status") != "OK":
-                        return None
-
-                    return data.get("data", {}).get("reviews", [])
+    async def _fetch_product_reviews(
+        self,
+        asin: str,
+        country: str = "US",
+        page: int = 1,
+        sort_by: str = "TOP_REVIEWS",
+        star_rating: str = "ALL",
+    ) -> Optional[List[Dict[str, Any]]]:
+        try:
+            params = {**self._REVIEWS_DEFAULTS, "asin": asin}
+            if country != "US":
+                params["country"] = country
+            if page != 1:
+                params["page"] = str(page)
+            if sort_by != "TOP_REVIEWS":
+                params["sort_by"] = sort_by
+            if star_rating != "ALL":
+                params["star_rating"] = star_rating
+
+            async with self._request(self._REVIEWS_URL, params) as response:
+                if response.status != 200:
+                    return None
+
+                data = orjson.loads(await response.read())
+                if data.get("status") != "OK":
+                    return None
+
+                return data.get("data", {}).get("reviews", [])
 
         except Exception as e:
             logger.error(f"Error fetching reviews: {str(e)}")
@@ -163,78 +734,79 @@ class RapidAPIAmazonClient:
                 items = [response_data] if response_data else []
 
         for item in items:
-            try:
-                asin = item.get("asin", "")
-                if not asin:
-                    continue
-
-                price = None
-                price_str = item.get("product_price") or item.get("price") or item.get("sale_price")
-                if price_str:
-                    price_str = str(price_str).replace("$", "").replace(",", "").strip()
-                    try:
-                        price = float(price_str)
-                    except Exception:
-                        pass
-
-                rating = None
-                review_count = None
-                rating_str = item.get("product_star_rating") or item.get("star_rating") or item.get("rating")
-                if rating_str:
-                    try:
-                        rating = float(rating_str)
-                    except Exception:
-                        pass
-
-                review_count_str = item.get("product_num_ratings") or item.get("num_ratings") or item.get("review_count")
-                if review_count_str:
-                    try:
-                        review_count = int(review_count_str)
-                    except Exception:
-                        pass
-
-                availability = "out_of_stock"
-                availability_text = item.get("product_availability") or item.get("availability", "")
-                if availability_text and any(
-                    word in availability_text.lower() for word in ["in stock", "available", "order soon"]
-                ):
-                    availability = "in_stock"
-
-                image_url = None
-                if "product_photo" in item:
-                    image_url = item["product_photo"]
-                elif (
-                    "product_images" in item
-                    and isinstance(item["product_images"], list)
-                    and len(item["product_images"]) > 0
-                ):
-                    image_url = item["product_images"][0]
-
-                shipping_info = None
-                if item.get("is_prime"):
-                    shipping_info = ShippingInfo(free_shipping=True, delivery_time="Prime shipping")
-
-                currency_val = item.get("currency") or "USD"
-                price_val = price
-                product = Product(
-                    id=f"amazon_{asin}",
-                    title=item.get("product_title") or item.get("title") or "Unknown Product",
-                    brand=item.get("product_brand") or item.get("brand"),
-                    price=price_val,
-                    currency=str(currency_val) if currency_val else "USD",
-                    platform="amazon",
-                    platform_id=asin,
-                    rating=rating,
-                    review_count=review_count,
-                    image_url=image_url,
-                    availability=availability,
-                    shipping_info=shipping_info,
-                    url=item.get("product_url") or item.get("url"),
-                )
+            product = self._transform_item(item)
+            if product is not None:
                 products.append(product)
 
-            except Exception as e:
-                logger.warning(f"Failed to transform item: {str(e)}")
-                continue
-
         return products
+
+    def _transform_item(self, item: Dict[str, Any]) -> Optional[Product]:
+        """Build a Product from one search item, or None if unusable."""
+        try:
+            asin = item.get("asin", "")
+            if not asin:
+                return None
+
+            # Malformed numeric fields are common in this feed, so check
+            # before converting: a failed fullmatch is a branch, a failed
+            # float() is a raised-and-caught exception per item
+            price = None
+            raw = _first(item, _PRICE_KEYS)
+            if isinstance(raw, (int, float)):
+                price = float(raw)
+            elif raw:
+                cleaned = str(raw).translate(_PRICE_TRANS)
+                if _FLOAT_RE.fullmatch(cleaned):
+                    price = float(cleaned)
+
+            rating = None
+            raw = _first(item, _RATING_KEYS)
+            if isinstance(raw, (int, float)):
+                rating = float(raw)
+            elif isinstance(raw, str) and _FLOAT_RE.fullmatch(raw.strip()):
+                rating = float(raw)
+
+            review_count = None
+            raw = _first(item, _RCOUNT_KEYS)
+            if isinstance(raw, int):
+                review_count = raw
+            elif isinstance(raw, str) and _INT_RE.fullmatch(raw.strip()):
+                review_count = int(raw)
+
+            availability = "out_of_stock"
+            availability_text = _first(item, _AVAIL_KEYS)
+            if isinstance(availability_text, str) and _AVAIL_RE.search(availability_text):
+                availability = "in_stock"
+
+            # One lookup per key instead of membership test + re-index
+            image_url = item.get("product_photo")
+            if image_url is None:
+                photos = item.get("product_images")
+                if isinstance(photos, list) and photos:
+                    image_url = photos[0]
+
+            shipping_info = None
+            if item.get("is_prime"):
+                shipping_info = ShippingInfo(free_shipping=True, delivery_time="Prime shipping")
+
+            currency_val = item.get("currency") or "USD"
+            price_val = price
+            return Product(
+                id=f"amazon_{asin}",
+                title=_first(item, _TITLE_KEYS) or "Unknown Product",
+                brand=_first(item, _BRAND_KEYS),
+                price=price_val,
+                currency=str(currency_val) if currency_val else "USD",
+                platform="amazon",
+                platform_id=asin,
+                rating=rating,
+                review_count=review_count,
+                image_url=image_url,
+                availability=availability,
+                shipping_info=shipping_info,
+                url=_first(item, _URL_KEYS),
+            )
+
+        except Exception as e:
+            logger.warning(f"Failed to transform item: {str(e)}")
+            return None
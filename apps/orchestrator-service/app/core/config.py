@@ -57,7 +57,12 @@ class Settings(BaseSettings):
     http_timeout: float = Field(default=30.0, description="HTTP client timeout in seconds")
     http_max_retries: int = Field(default=3, description="Maximum HTTP retry attempts")
     http_retry_backoff: float = Field(default=1.0, description="Retry backoff multiplier")
+    http_compress_requests: bool = Field(default=False, description="Gzip large upstream JSON request bodies (requires decompression support on the receiving services)")
     
+    # Session Cache (Redis)
+    redis_url: Optional[str] = Field(default=None, description="Redis URL for the session read-through cache (disabled when unset)")
+    session_cache_ttl_seconds: int = Field(default=60, description="TTL for cached session state in seconds")
+
     # Workflow Settings
     max_clarification_loops: int = Field(default=2, description="Maximum clarification loops per session")
     session_ttl_hours: int = Field(default=24, description="Session TTL in hours")
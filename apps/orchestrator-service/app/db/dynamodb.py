@@ -12,6 +12,7 @@ import json
 
 from app.core.aws_clients import get_sessions_table, get_checkpoints_table, DynamoDBClientError
 from app.core.errors import SessionNotFoundError, DynamoDBError
+from app.db.session_cache import session_cache
 from app.models.schemas import SessionState, RequirementSpec, SearchResults
 from app.models.enums import WorkflowStage, RequestType
 
@@ -70,7 +71,10 @@ class SessionRepository:
             }
             
             self.table.put_item(Item=item)
-            
+
+            if session_cache.enabled:
+                await session_cache.set(session_id, session.model_dump_json())
+
             logger.info(
                 f"Session created",
                 extra={"session_id": session_id, "user_id": user_id}
@@ -99,6 +103,13 @@ class SessionRepository:
         Raises:
             DynamoDBError: If retrieval fails
         """
+        # Read-through cache: chat clients re-read the same session
+        # constantly, so most lookups never reach DynamoDB
+        if session_cache.enabled:
+            cached = await session_cache.get(session_id)
+            if cached is not None:
+                return SessionState.model_validate_json(cached)
+
         try:
             response = self.table.get_item(
                 Key={
@@ -138,6 +149,9 @@ class SessionRepository:
                 metadata=json.loads(item.get('metadata', '{}'))
             )
             
+            if session_cache.enabled:
+                await session_cache.set(session_id, session.model_dump_json())
+
             logger.debug(f"Session retrieved", extra={"session_id": session_id})
             return session
             
@@ -218,7 +232,11 @@ class SessionRepository:
                 f"Session updated",
                 extra={"session_id": session_id, "updates": list(updates.keys())}
             )
-            
+
+            # Drop the stale cache entry before the read-through re-fetch
+            if session_cache.enabled:
+                await session_cache.invalidate(session_id)
+
             # Fetch and return updated session
             return await self.get_session(session_id)
             
@@ -331,6 +349,9 @@ class SessionRepository:
                 ReturnValues="UPDATED_NEW"
             )
             
+            if session_cache.enabled:
+                await session_cache.invalidate(session_id)
+
             new_count = response['Attributes']['clarification_count']
             logger.info(
                 f"Clarification count incremented",
@@ -365,6 +386,9 @@ class SessionRepository:
                 }
             )
             
+            if session_cache.enabled:
+                await session_cache.invalidate(session_id)
+
             logger.info(f"Session deleted", extra={"session_id": session_id})
             
         except ClientError as e:
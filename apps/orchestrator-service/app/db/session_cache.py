@@ -0,0 +1,85 @@
+"""
+Redis read-through cache for session state.
+
+Sits in front of the DynamoDB sessions table: chat clients re-read the
+same session constantly, so a short-TTL cache turns most lookups into a
+sub-millisecond Redis GET. Disabled transparently when redis is not
+installed or no redis_url is configured.
+"""
+
+import logging
+from typing import Optional
+
+from app.core.config import settings
+
+# Optional dependency: cache is a no-op without it
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCache:
+    """Short-TTL read-through cache keyed by session ID."""
+
+    def __init__(self):
+        self._client = None
+        if aioredis is not None and settings.redis_url:
+            self._client = aioredis.from_url(settings.redis_url)
+            logger.info(
+                "Session cache enabled",
+                extra={"ttl_seconds": settings.session_cache_ttl_seconds}
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis backend is configured."""
+        return self._client is not None
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"sess:{session_id}"
+
+    async def get(self, session_id: str) -> Optional[bytes]:
+        """Get cached session JSON, or None on miss/error."""
+        if self._client is None:
+            return None
+        try:
+            return await self._client.get(self._key(session_id))
+        except Exception as e:
+            logger.warning(f"Session cache read failed: {str(e)}")
+            return None
+
+    async def set(self, session_id: str, payload: str) -> None:
+        """Cache session JSON with the configured TTL."""
+        if self._client is None:
+            return
+        try:
+            await self._client.set(
+                self._key(session_id),
+                payload,
+                ex=settings.session_cache_ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Session cache write failed: {str(e)}")
+
+    async def invalidate(self, session_id: str) -> None:
+        """Drop a session from the cache after a mutation."""
+        if self._client is None:
+            return
+        try:
+            await self._client.delete(self._key(session_id))
+        except Exception as e:
+            logger.warning(f"Session cache invalidation failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Close the Redis connection."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global session cache instance
+session_cache = SessionCache()
@@ -4,6 +4,8 @@ Base HTTP client with retry logic and error handling.
 Provides a reusable async HTTP client for service-to-service communication.
 """
 
+import gzip
+import json
 import logging
 import asyncio
 from typing import Optional, Dict, Any
@@ -22,6 +24,9 @@ from app.core.errors import ServiceUnavailableError, ServiceTimeoutError, MaxRet
 
 logger = logging.getLogger(__name__)
 
+# JSON bodies above this size are gzip-compressed before sending
+GZIP_THRESHOLD_BYTES = 4096
+
 
 class BaseServiceClient:
     """Base class for HTTP service clients with retry and error handling."""
@@ -178,7 +183,25 @@ class BaseServiceClient:
         return response.json()
     
     async def post(self, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make POST request and return JSON."""
+        """Make POST request and return JSON.
+
+        With http_compress_requests enabled, large JSON payloads (e.g.
+        rank calls shipping hundreds of products) are gzip-compressed;
+        these calls are network-bound, so a cheap compression level
+        shrinks them 5-10x for minimal CPU. Off by default because the
+        receiving services must be able to decompress request bodies.
+        """
+        json_payload = kwargs.pop("json", None)
+        if json_payload is not None:
+            body = json.dumps(json_payload).encode("utf-8") if settings.http_compress_requests else None
+            if body is not None and len(body) > GZIP_THRESHOLD_BYTES:
+                headers = dict(kwargs.pop("headers", None) or {})
+                headers["Content-Type"] = "application/json"
+                headers["Content-Encoding"] = "gzip"
+                kwargs["content"] = gzip.compress(body, compresslevel=1)
+                kwargs["headers"] = headers
+            else:
+                kwargs["json"] = json_payload
         response = await self._request("POST", endpoint, **kwargs)
         return response.json()
     
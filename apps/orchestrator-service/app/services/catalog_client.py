@@ -5,9 +5,12 @@ Handles communication with the catalog-service for marketplace searches.
 """
 
 import logging
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
 from app.core.config import settings
 from app.core.errors import CatalogSearchError
 from app.models.schemas import RequirementSpec, ProductResult, SearchResults
@@ -17,14 +20,70 @@ from app.services.base_client import BaseServiceClient
 logger = logging.getLogger(__name__)
 
 
+class RawProductDTO(BaseModel):
+    """Product item as returned by the catalog-service wire format."""
+
+    id: Optional[str] = None
+    platform_id: Optional[str] = None
+    platform: Optional[str] = None
+    title: str = "Unknown Product"
+    description: Optional[str] = None
+    price: Optional[float] = None
+    currency: str = "USD"
+    rating: Optional[float] = None
+    review_count: Optional[int] = None
+    availability: Optional[str] = None
+    image_url: Optional[str] = None
+    url: Optional[str] = None
+    brand: Optional[str] = None
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+
+
+# Validates the whole product list in one pydantic-core pass
+_raw_products_adapter = TypeAdapter(List[RawProductDTO])
+
+
+def _to_product_result(raw: RawProductDTO) -> ProductResult:
+    """Map a validated catalog wire item onto the orchestrator model."""
+    platform_raw = raw.platform or "amazon"
+    marketplace = (
+        MarketplaceProvider(platform_raw)
+        if platform_raw in MarketplaceProvider._value2member_map_
+        else MarketplaceProvider.AMAZON
+    )
+    deep_link = raw.url or raw.image_url or ""
+    return ProductResult(
+        product_id=raw.id or raw.platform_id or f"{marketplace.value}_{raw.title}",
+        marketplace=marketplace,
+        title=raw.title,
+        description=raw.description,
+        price=raw.price if raw.price is not None else 0.0,
+        currency=raw.currency,
+        rating=raw.rating,
+        review_count=raw.review_count,
+        condition=None,
+        availability=raw.availability or "unknown",
+        image_url=raw.image_url,
+        deep_link=deep_link,
+        marketplace_url=deep_link,
+        seller_name=raw.brand,
+        attributes=raw.attributes,
+    )
+
+
 class CatalogServiceClient(BaseServiceClient):
     """Client for catalog/marketplace search service."""
-    
+
+    # How long a failed price-history lookup is remembered before retrying
+    PRICE_HISTORY_NEGATIVE_TTL = 60.0
+
     def __init__(self, base_url: Optional[str] = None):
         super().__init__(
             base_url=base_url or settings.catalog_service_url,
             service_name="catalog-service"
         )
+        # (product_id, marketplace, days) -> monotonic expiry of a known failure
+        self._price_history_negative_cache: Dict[tuple, float] = {}
     
     async def search_products(
         self,
@@ -49,15 +108,17 @@ class CatalogServiceClient(BaseServiceClient):
         try:
             start_time = datetime.utcnow()
             
-            logger.info(
-                "Searching products",
-                extra={
-                    "product_type": requirement_spec.product_type,
-                    "marketplaces": [m.value for m in requirement_spec.marketplaces],
-                    "limit": limit
-                }
-            )
-            
+            # Building extra dicts iterates marketplaces; skip when INFO is off
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Searching products",
+                    extra={
+                        "product_type": requirement_spec.product_type,
+                        "marketplaces": [m.value for m in requirement_spec.marketplaces],
+                        "limit": limit
+                    }
+                )
+
             payload = {
                 "requirement_spec": requirement_spec.model_dump(),
                 "limit": limit,
@@ -77,42 +138,22 @@ class CatalogServiceClient(BaseServiceClient):
                 **request_kwargs
             )
             
-            products = []
-            for product_data in response.get("products", []):
-                try:
-                    platform_raw = product_data.get("platform") or "amazon"
-                    marketplace = MarketplaceProvider(platform_raw) if platform_raw in MarketplaceProvider._value2member_map_ else MarketplaceProvider.AMAZON
-                    deep_link = product_data.get("url") or product_data.get("image_url") or ""
-                    marketplace_url = deep_link
-                    price_val = product_data.get("price")
-                    price = float(price_val) if price_val is not None else 0.0
-                    availability = product_data.get("availability") or "unknown"
-                    product_id = product_data.get("id") or product_data.get("platform_id") or f"{marketplace.value}_{product_data.get('title','item')}"
-
-                    products.append(
-                        ProductResult(
-                            product_id=product_id,
-                            marketplace=marketplace,
-                            title=product_data.get("title", "Unknown Product"),
-                            description=product_data.get("description"),
-                            price=price,
-                            currency=product_data.get("currency", "USD"),
-                            rating=product_data.get("rating"),
-                            review_count=product_data.get("review_count"),
-                            condition=None,
-                            availability=availability,
-                            image_url=product_data.get("image_url"),
-                            deep_link=deep_link,
-                            marketplace_url=marketplace_url,
-                            seller_name=product_data.get("brand"),
-                            attributes=product_data.get("attributes", {}),
-                        )
-                    )
-                except Exception as e:
-                    logger.warning(
-                        "Skipping product due to mapping error",
-                        extra={"product_data": product_data, "error": str(e)},
-                    )
+            raw_products = response.get("products", [])
+            try:
+                validated = _raw_products_adapter.validate_python(raw_products)
+            except ValidationError as e:
+                # Drop only the offending items and validate the rest;
+                # surface their errors as one aggregated log line
+                bad_indices = {err["loc"][0] for err in e.errors() if err["loc"]}
+                logger.warning(
+                    "Skipping products due to validation errors",
+                    extra={"skipped": len(bad_indices), "errors": e.errors()},
+                )
+                validated = _raw_products_adapter.validate_python(
+                    [item for i, item in enumerate(raw_products) if i not in bad_indices]
+                )
+
+            products = [_to_product_result(raw) for raw in validated]
             
             # Calculate search duration
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
@@ -128,15 +169,16 @@ class CatalogServiceClient(BaseServiceClient):
                 search_duration_ms=duration_ms
             )
             
-            logger.info(
-                "Product search completed",
-                extra={
-                    "product_count": len(products),
-                    "duration_ms": duration_ms,
-                    "marketplaces": len(search_results.marketplaces_searched)
-                }
-            )
-            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Product search completed",
+                    extra={
+                        "product_count": len(products),
+                        "duration_ms": duration_ms,
+                        "marketplaces": len(search_results.marketplaces_searched)
+                    }
+                )
+
             return search_results
             
         except Exception as e:
@@ -201,25 +243,28 @@ class CatalogServiceClient(BaseServiceClient):
         self,
         products: List[ProductResult],
         requirement_spec: RequirementSpec,
-        ranking_criteria: Optional[Dict[str, Any]] = None
+        ranking_criteria: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = None
     ) -> List[ProductResult]:
         """
         Rank and sort products based on criteria.
-        
+
         Args:
             products: List of products to rank
             requirement_spec: Original requirements
             ranking_criteria: Custom ranking criteria
-            
+            top_k: Only the first K ranked products are needed; lets the
+                server use a partial sort and keeps the response small
+
         Returns:
-            List[ProductResult]: Ranked products
-            
+            List[ProductResult]: Ranked products (at most top_k when given)
+
         Raises:
             CatalogSearchError: If ranking fails
         """
         try:
             logger.debug(f"Ranking {len(products)} products")
-            
+
             payload = {
                 "products": [p.model_dump() for p in products],
                 "requirement_spec": requirement_spec.model_dump(),
@@ -227,21 +272,26 @@ class CatalogServiceClient(BaseServiceClient):
                     "price_weight": 0.3,
                     "rating_weight": 0.3,
                     "relevance_weight": 0.4
-                }
+                },
+                "top_k": top_k
             }
-            
+
             response = await self.post(
                 "/api/v1/rank",
                 json=payload
             )
-            
+
             ranked_products = [
                 ProductResult(**product_data)
                 for product_data in response.get("products", [])
             ]
-            
+
+            # Older catalog servers ignore top_k and return the full list
+            if top_k is not None:
+                ranked_products = ranked_products[:top_k]
+
             logger.debug(f"Products ranked successfully")
-            
+
             return ranked_products
             
         except Exception as e:
@@ -251,7 +301,7 @@ class CatalogServiceClient(BaseServiceClient):
             )
             # Return original list if ranking fails
             logger.warning("Returning unranked products due to ranking failure")
-            return products
+            return products[:top_k] if top_k is not None else products
     
     async def get_price_history(
         self,
@@ -273,12 +323,20 @@ class CatalogServiceClient(BaseServiceClient):
         Raises:
             CatalogSearchError: If retrieval fails
         """
+        cache_key = (product_id, marketplace.value, days)
+        expires_at = self._price_history_negative_cache.get(cache_key)
+        if expires_at is not None:
+            if time.monotonic() < expires_at:
+                # Recently failed for this product; don't storm upstream
+                return []
+            del self._price_history_negative_cache[cache_key]
+
         try:
             logger.debug(
                 "Fetching price history",
                 extra={"product_id": product_id, "days": days}
             )
-            
+
             response = await self.get(
                 f"/api/v1/products/{product_id}/price-history",
                 params={
@@ -286,15 +344,18 @@ class CatalogServiceClient(BaseServiceClient):
                     "days": days
                 }
             )
-            
+
             return response.get("history", [])
-            
+
         except Exception as e:
             logger.warning(
                 f"Failed to get price history: {str(e)}",
                 extra={"product_id": product_id}
             )
-            # Return empty list if price history unavailable
+            # Remember the failure briefly, then return empty list
+            self._price_history_negative_cache[cache_key] = (
+                time.monotonic() + self.PRICE_HISTORY_NEGATIVE_TTL
+            )
             return []
 
 
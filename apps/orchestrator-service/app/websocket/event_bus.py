@@ -0,0 +1,128 @@
+"""
+Redis pub/sub event bus for cross-worker WebSocket delivery.
+
+A single worker holds each WebSocket, but graph execution can run on a
+different worker (or service) than the one holding the socket. The bus
+gives every session a Redis channel (``session:{sid}``): workers publish
+pre-serialized frames to it, and whichever worker holds the socket
+routes them into that connection's send queue. Disabled transparently
+when redis is not installed or no redis_url is configured, in which
+case delivery stays purely in-process.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+# Optional dependency: the bus is a no-op without it
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class EventBus:
+    """Per-session Redis pub/sub bridge into local send queues."""
+
+    def __init__(self):
+        self._client = None
+        self._pubsub = None
+        self._routes: Dict[str, asyncio.Queue] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        if aioredis is not None and settings.redis_url:
+            self._client = aioredis.from_url(settings.redis_url)
+            logger.info("WebSocket event bus enabled")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a Redis backend is configured."""
+        return self._client is not None
+
+    @staticmethod
+    def _channel(session_id: str) -> str:
+        return f"session:{session_id}"
+
+    async def subscribe(self, session_id: str, queue: asyncio.Queue) -> None:
+        """Route frames published for a session into its send queue."""
+        if self._client is None:
+            return
+        try:
+            if self._pubsub is None:
+                self._pubsub = self._client.pubsub()
+            self._routes[session_id] = queue
+            await self._pubsub.subscribe(self._channel(session_id))
+            if self._listener_task is None or self._listener_task.done():
+                self._listener_task = asyncio.create_task(self._listener_loop())
+        except Exception as e:
+            self._routes.pop(session_id, None)
+            logger.warning(f"Event bus subscribe failed: {str(e)}")
+
+    async def unsubscribe(self, session_id: str) -> None:
+        """Stop routing frames for a session."""
+        if self._routes.pop(session_id, None) is None or self._pubsub is None:
+            return
+        try:
+            await self._pubsub.unsubscribe(self._channel(session_id))
+        except Exception as e:
+            logger.warning(f"Event bus unsubscribe failed: {str(e)}")
+
+    async def publish(self, session_id: str, frame: str) -> int:
+        """
+        Publish a pre-serialized frame to a session's channel.
+
+        Returns the number of subscribers that received it (0 means no
+        worker currently holds the socket).
+        """
+        if self._client is None:
+            return 0
+        try:
+            return await self._client.publish(self._channel(session_id), frame)
+        except Exception as e:
+            logger.warning(f"Event bus publish failed: {str(e)}")
+            return 0
+
+    async def _listener_loop(self) -> None:
+        """Fan incoming pub/sub messages into the local send queues."""
+        try:
+            async for message in self._pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                queue = self._routes.get(channel.split(":", 1)[1])
+                if queue is None:
+                    continue
+                data = message["data"]
+                frame = data.decode() if isinstance(data, bytes) else data
+                try:
+                    queue.put_nowait(frame)
+                except asyncio.QueueFull:
+                    logger.warning("Send queue full, dropping bus frame")
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Event bus listener error: {str(e)}", exc_info=True)
+
+    async def close(self) -> None:
+        """Tear down the listener and Redis connections."""
+        if self._listener_task and not self._listener_task.done():
+            self._listener_task.cancel()
+        self._routes.clear()
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+            self._pubsub = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global event bus instance
+event_bus = EventBus()
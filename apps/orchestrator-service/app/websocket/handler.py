@@ -7,9 +7,12 @@ Full LangGraph integration will be added in the graph nodes implementation.
 
 import logging
 import asyncio
+import time
 from datetime import datetime
 from fastapi import WebSocket
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import orjson
+from pydantic import TypeAdapter
 
 from app.websocket.manager import manager
 from app.models.enums import EventType
@@ -20,6 +23,80 @@ from app.graph.graph import buyer_flow_graph
 
 logger = logging.getLogger(__name__)
 
+# Token batching: flush after this many tokens or this many seconds
+TOKEN_BATCH_SIZE = 16
+TOKEN_BATCH_INTERVAL = 0.025
+
+# Precompiled validator: TypeAdapter dispatches straight into the
+# cached pydantic-core schema, skipping the Python-level __init__ path
+_client_message_adapter = TypeAdapter(ClientMessage)
+
+# Hot-path message-type constants: `is` on the Enum singleton and a set
+# lookup skip repeated Enum __eq__ dispatch per inbound frame
+_PONG_VALUE = EventType.PONG.value
+_DISCONNECT = EventType.DISCONNECT
+_MSG_OR_ANSWER = frozenset({EventType.MESSAGE, EventType.ANSWER})
+
+# Only these top-level nodes produce PROGRESS events; the rest are
+# routing/bookkeeping noise the UI doesn't render
+_PROGRESS_NODES = frozenset({
+    "parse_input",
+    "ask_clarifying_q",
+    "search_marketplaces",
+    "rank_and_compose",
+    "done",
+})
+
+
+class TokenBatcher:
+    """
+    Coalesces streamed LLM tokens into batched TOKEN events.
+
+    One WebSocket frame per token pays JSON + framing + syscall overhead
+    for a few bytes of content. Batching flushes every TOKEN_BATCH_SIZE
+    tokens or TOKEN_BATCH_INTERVAL seconds, whichever comes first, so
+    frame count drops by an order of magnitude without visible latency.
+    """
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.parts: List[str] = []
+        self.last_flush = time.monotonic()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def add(self, content: str) -> None:
+        """Buffer a token, flushing when the batch is full or overdue."""
+        self.parts.append(content)
+        if (
+            len(self.parts) >= TOKEN_BATCH_SIZE
+            or time.monotonic() - self.last_flush > TOKEN_BATCH_INTERVAL
+        ):
+            await self.flush()
+        elif self._flush_handle is None:
+            # Make sure trailing tokens flush even if no more arrive
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(
+                TOKEN_BATCH_INTERVAL,
+                lambda: asyncio.create_task(self.flush())
+            )
+
+    async def flush(self) -> None:
+        """Emit buffered tokens as a single TOKEN event."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self.parts:
+            return
+        content = "".join(self.parts)
+        self.parts.clear()
+        self.last_flush = time.monotonic()
+        await manager.send_event(
+            self.session_id,
+            EventType.TOKEN,
+            {"content": content, "is_complete": False},
+            log_event=False
+        )
+
 
 async def handle_websocket_messages(
     websocket: WebSocket,
@@ -51,25 +128,31 @@ async def handle_websocket_messages(
             )
         
         while True:
-            # Receive message from client
-            data = await websocket.receive_json()
-            
+            # Receive message from client; parse with orjson instead of
+            # Starlette's receive_json (stdlib json + extra copying)
+            message = await websocket.receive()
+            if message.get("type") == "websocket.disconnect":
+                break
+            data = orjson.loads(message.get("text") or message["bytes"])
+
+            # Fast-path heartbeat responses: PONGs arrive every interval
+            # on every connection and don't need full model validation
+            if data.get("type") == _PONG_VALUE:
+                metadata = manager.get_session_metadata(session_id)
+                if metadata:
+                    metadata.update_heartbeat()
+                continue
+
             try:
-                client_msg = ClientMessage(**data)
-                logger.debug(
-                    f"Received message type: {client_msg.type}",
-                    extra={"session_id": session_id, "type": client_msg.type}
-                )
-                
+                client_msg = _client_message_adapter.validate_python(data)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Received message type: {client_msg.type}",
+                        extra={"session_id": session_id, "type": client_msg.type}
+                    )
+
                 # Handle different message types
-                if client_msg.type == EventType.PONG:
-                    # Heartbeat response
-                    metadata = manager.get_session_metadata(session_id)
-                    if metadata:
-                        metadata.update_heartbeat()
-                    continue
-                
-                elif client_msg.type in [EventType.MESSAGE, EventType.ANSWER]:
+                if client_msg.type in _MSG_OR_ANSWER:
                     # Process user message through LangGraph (streaming)
                     await process_user_message(
                         session_id,
@@ -77,7 +160,7 @@ async def handle_websocket_messages(
                         client_msg
                     )
                 
-                elif client_msg.type == EventType.DISCONNECT:
+                elif client_msg.type is _DISCONNECT:
                     logger.info(f"Client requested disconnect: {session_id}")
                     break
                 
@@ -180,6 +263,79 @@ async def process_user_message(
         )
 
 
+def _build_results_payload(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Serialize ranked results once into a RESULTS event payload."""
+    requirement_spec = state.get("requirement_spec")
+    return {
+        "products": [
+            r.model_dump() if hasattr(r, "model_dump") else r
+            for r in state.get("ranked_results", [])
+        ],
+        "requirement_spec": requirement_spec.model_dump() if requirement_spec else None,
+        "final_response": state.get("final_response"),
+    }
+
+
+async def _handle_clarification_node(
+    session_id: str, output: Dict[str, Any], state: Dict[str, Any]
+) -> None:
+    """ask_clarifying_q: emit CLARIFICATION and pause the stream."""
+    state["clarification_state"] = output
+    await manager.send_event(
+        session_id,
+        EventType.CLARIFICATION,
+        {
+            "question": output.get("clarifying_question"),
+            "context": output.get("clarifying_context") or output.get("clarification_reason"),
+            "suggestions": output.get("clarifying_suggestions") or []
+        }
+    )
+
+
+async def _handle_search_node(
+    session_id: str, output: Dict[str, Any], state: Dict[str, Any]
+) -> None:
+    """search_marketplaces: report how many products were found."""
+    raw_results = output.get("raw_search_results")
+    count = len(raw_results.products) if hasattr(raw_results, "products") else len(raw_results or [])
+    await manager.send_event(
+        session_id,
+        EventType.PROGRESS,
+        {
+            "step": "search_complete",
+            "message": f"Found {count} products"
+        }
+    )
+
+
+async def _handle_rank_node(
+    session_id: str, output: Dict[str, Any], state: Dict[str, Any]
+) -> None:
+    """rank_and_compose: serialize and emit RESULTS."""
+    state["results_payload"] = _build_results_payload(output)
+    state["results_sent"] = await manager.send_event(
+        session_id,
+        EventType.RESULTS,
+        state["results_payload"]
+    )
+
+
+async def _handle_done_node(
+    session_id: str, output: Dict[str, Any], state: Dict[str, Any]
+) -> None:
+    """done: remember the final graph state for the terminal events."""
+    state["final_state"] = output
+
+
+# O(1) dispatch instead of an if-chain of string compares per update
+_NODE_HANDLERS = {
+    "ask_clarifying_q": _handle_clarification_node,
+    "search_marketplaces": _handle_search_node,
+    "rank_and_compose": _handle_rank_node,
+    "done": _handle_done_node,
+}
+
+
 async def stream_workflow_events(
     session_id: str,
     user_id: str,
@@ -195,134 +351,93 @@ async def stream_workflow_events(
         client_msg: Message from client
         is_resume: Whether this is a resume after clarification
     """
-    # Base state shared across invocations
-    base_state: Dict[str, Any] = {
+    # Build the initial state in one allocation instead of a base dict
+    # plus a **spread copy
+    initial_state: Dict[str, Any] = {
         "session_id": session_id,
         "user_id": user_id,
         "media_refs": client_msg.media or [],
         "node_trace": [],
         "llm_calls": [],
         "retry_count": 0,
-    }
-    
-    # Initial or resume payload
-    initial_state: Dict[str, Any] = {
-        **base_state,
         "user_message": client_msg.message or "",
     }
-    
+
     if is_resume:
         # When resuming, clear clarification flags so graph continues
-        initial_state.update({
-            "needs_clarification": False,
-        })
-    
+        initial_state["needs_clarification"] = False
+
     config = {"configurable": {"thread_id": session_id}}
-    final_state: Optional[Dict[str, Any]] = None
-    clarification_state: Optional[Dict[str, Any]] = None
-    
-    # langgraph astream_events requires explicit version kwarg for streaming
-    async for event in buyer_flow_graph.astream_events(initial_state, config=config, version="v1"):
-        event_type = event.get("event")
-        node_name = event.get("name")
-        data = event.get("data", {})
-        
-        # Node started
-        if event_type == "on_chain_start":
-            await manager.send_event(
-                session_id,
-                EventType.PROGRESS,
-                {
-                    "step": node_name,
-                    "message": f"Executing: {node_name}"
-                }
-            )
-        
-        # Streamed LLM tokens
-        elif event_type == "on_chat_model_stream":
-            chunk = data.get("chunk")
-            content = getattr(chunk, "content", None) or getattr(chunk, "text", None)
+    stream_state: Dict[str, Any] = {
+        "final_state": None,
+        "clarification_state": None,
+        "results_payload": None,
+        "results_sent": False,
+    }
+    token_batcher = TokenBatcher(session_id)
+
+    # stream_mode=["messages","updates"] is much cheaper than
+    # astream_events: tokens arrive without callback fan-out through the
+    # runtime and node outputs arrive once per graph node, not once per
+    # inner runnable
+    async for mode, chunk in buyer_flow_graph.astream(
+        initial_state, config=config, stream_mode=["messages", "updates"]
+    ):
+        # Streamed LLM tokens: chunk is (AIMessageChunk, metadata)
+        if mode == "messages":
+            message_chunk, _metadata = chunk
+            content = getattr(message_chunk, "content", None) or getattr(message_chunk, "text", None)
             if content:
+                await token_batcher.add(content)
+            continue
+
+        # Node updates: chunk is {node_name: output}
+        for node_name, output in chunk.items():
+            # Keep event ordering: buffered tokens go out before node events
+            await token_batcher.flush()
+
+            if node_name in _PROGRESS_NODES:
                 await manager.send_event(
                     session_id,
-                    EventType.TOKEN,
-                    {
-                        "content": content,
-                        "is_complete": False
-                    },
-                    log_event=False
-                )
-        
-        # Node completed
-        elif event_type == "on_chain_end":
-            output = data.get("output", {})
-            
-            if node_name == "ask_clarifying_q":
-                clarification_state = output
-                await manager.send_event(
-                    session_id,
-                    EventType.CLARIFICATION,
+                    EventType.PROGRESS,
                     {
-                        "question": output.get("clarifying_question"),
-                        "context": output.get("clarifying_context") or output.get("clarification_reason"),
-                        "suggestions": output.get("clarifying_suggestions") or []
+                        "step": node_name,
+                        "message": f"Executing: {node_name}"
                     }
                 )
+
+            handler = _NODE_HANDLERS.get(node_name)
+            if handler:
+                await handler(session_id, output or {}, stream_state)
+
+            if stream_state["clarification_state"] is not None:
                 # Clarification pauses the workflow; exit streaming loop
                 break
-            
-            if node_name == "search_marketplaces":
-                raw_results = output.get("raw_search_results")
-                count = len(raw_results.products) if hasattr(raw_results, "products") else len(raw_results or [])
-                await manager.send_event(
-                    session_id,
-                    EventType.PROGRESS,
-                    {
-                        "step": "search_complete",
-                        "message": f"Found {count} products"
-                    }
-                )
-            
-            if node_name == "rank_and_compose":
-                await manager.send_event(
-                    session_id,
-                    EventType.RESULTS,
-                    {
-                        "products": [
-                            r.model_dump() if hasattr(r, "model_dump") else r
-                            for r in output.get("ranked_results", [])
-                        ],
-                        "requirement_spec": output.get("requirement_spec").model_dump() if output.get("requirement_spec") else None,
-                        "final_response": output.get("final_response"),
-                    }
-                )
-            
-            if node_name == "done":
-                final_state = output
-        
-        # Graph ended
-        elif event_type == "on_end":
-            final_state = data.get("output", final_state)
-    
+
+        if stream_state["clarification_state"] is not None:
+            break
+
+    # Flush any trailing tokens before terminal events
+    await token_batcher.flush()
+
     # If clarification was requested, stop here (client will send ANSWER to resume)
-    if clarification_state:
+    if stream_state["clarification_state"]:
         return
-    
+
+    final_state = stream_state["final_state"]
+    results_payload = stream_state["results_payload"]
+    results_sent = stream_state["results_sent"]
+
     # Send completion if we reached the end
     if final_state is not None:
-        # Ensure results are emitted even if rank_and_compose wasn't caught
-        if "ranked_results" in final_state:
+        # Emit RESULTS only if the rank_and_compose branch didn't already;
+        # re-sending serialized every product model twice per turn
+        if not results_sent and "ranked_results" in final_state:
             await manager.send_event(
                 session_id,
                 EventType.RESULTS,
-                {
-                    "products": [
-                        r.model_dump() if hasattr(r, "model_dump") else r
-                        for r in final_state.get("ranked_results", [])
-                    ],
-                    "requirement_spec": final_state.get("requirement_spec").model_dump() if final_state.get("requirement_spec") else None,
-                    "final_response": final_state.get("final_response"),
-                }
+                results_payload if results_payload is not None
+                else _build_results_payload(final_state)
             )
         
         await manager.send_event(
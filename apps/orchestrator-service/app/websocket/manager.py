@@ -6,59 +6,88 @@ Manages active WebSocket connections, heartbeats, and message routing.
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Dict, List, Optional, Set
 from fastapi import WebSocket
-import json
+from starlette.websockets import WebSocketState
+import orjson
 
 from app.core.config import settings
 from app.core.errors import WebSocketError
 from app.models.enums import EventType
 from app.models.schemas import ServerEvent
+from app.websocket.event_bus import event_bus
 
 logger = logging.getLogger(__name__)
 
+# Bounded per-connection send queue; TOKEN frames are dropped oldest-first
+# when a slow client falls this far behind
+SEND_QUEUE_MAXSIZE = 256
+
+# Keepalive frame encoded once at import: PINGs carry no per-tick state
+# (clients answer with PONG; activity is tracked server-side), so 10k idle
+# connections share this single string
+_PING_FRAME = orjson.dumps({"type": EventType.PING.value, "data": {}}).decode()
+
 
 class ConnectionMetadata:
     """Metadata for an active WebSocket connection."""
-    
+
+    # One instance per connection: __slots__ drops the per-instance
+    # __dict__ and speeds up attribute access on heartbeat/cleanup sweeps
+    __slots__ = (
+        "user_id",
+        "session_id",
+        "connected_at",
+        "_connected_monotonic",
+        "last_heartbeat",
+        "last_activity",
+        "message_count",
+        "error_count",
+    )
+
     def __init__(self, user_id: str, session_id: str):
         self.user_id = user_id
         self.session_id = session_id
+        # Wall-clock time is kept only for display; the hot-path
+        # timestamps are monotonic floats, which are ~10x cheaper than
+        # datetime objects and immune to NTP clock jumps
         self.connected_at = datetime.utcnow()
-        self.last_heartbeat = datetime.utcnow()
-        self.last_activity = datetime.utcnow()
+        self._connected_monotonic = time.monotonic()
+        self.last_heartbeat = self._connected_monotonic
+        self.last_activity = self._connected_monotonic
         self.message_count = 0
         self.error_count = 0
-    
+
     def update_heartbeat(self) -> None:
         """Update last heartbeat timestamp."""
-        self.last_heartbeat = datetime.utcnow()
-    
+        self.last_heartbeat = time.monotonic()
+
     def update_activity(self) -> None:
         """Update last activity timestamp."""
-        self.last_activity = datetime.utcnow()
-    
+        self.last_activity = time.monotonic()
+
     def increment_message_count(self) -> None:
         """Increment message counter."""
         self.message_count += 1
-    
+
     def increment_error_count(self) -> None:
         """Increment error counter."""
         self.error_count += 1
-    
+
     def is_stale(self, timeout_seconds: int = 300) -> bool:
         """Check if connection is stale (no activity)."""
-        return datetime.utcnow() - self.last_activity > timedelta(seconds=timeout_seconds)
-    
+        return time.monotonic() - self.last_activity > timeout_seconds
+
     def is_heartbeat_overdue(self) -> bool:
         """Check if heartbeat is overdue."""
         timeout = settings.ws_heartbeat_interval * 2  # Allow 2x interval before considering overdue
-        return datetime.utcnow() - self.last_heartbeat > timedelta(seconds=timeout)
-    
+        return time.monotonic() - self.last_heartbeat > timeout
+
     def get_connection_duration(self) -> float:
         """Get connection duration in seconds."""
-        return (datetime.utcnow() - self.connected_at).total_seconds()
+        return time.monotonic() - self._connected_monotonic
 
 
 class ConnectionManager:
@@ -76,10 +105,13 @@ class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_metadata: Dict[str, ConnectionMetadata] = {}
-        self._heartbeat_tasks: Dict[str, asyncio.Task] = {}
+        self._send_queues: Dict[str, asyncio.Queue] = {}
+        # Pre-encoded per-session envelope tail for the TOKEN fast path
+        self._session_suffixes: Dict[str, bytes] = {}
+        self._writer_tasks: Dict[str, asyncio.Task] = {}
+        self._heartbeat_task: Optional[asyncio.Task] = None
         self._cleanup_task: Optional[asyncio.Task] = None
-        self._lock = asyncio.Lock()
-        
+
         logger.info("ConnectionManager initialized")
     
     async def connect(
@@ -101,25 +133,41 @@ class ConnectionManager:
         """
         try:
             await websocket.accept()
-            
-            async with self._lock:
-                # Check connection limit
-                if len(self.active_connections) >= settings.ws_max_concurrent_connections:
-                    logger.warning(
-                        f"Connection limit reached ({settings.ws_max_concurrent_connections})",
-                        extra={"user_id": user_id, "session_id": session_id}
-                    )
-                    await websocket.close(code=1008, reason="Connection limit reached")
-                    raise WebSocketError("Maximum concurrent connections reached")
-                
-                # Register connection
-                self.active_connections[session_id] = websocket
-                self.connection_metadata[session_id] = ConnectionMetadata(user_id, session_id)
-            
-            # Start heartbeat
-            heartbeat_task = asyncio.create_task(self._heartbeat_loop(session_id))
-            self._heartbeat_tasks[session_id] = heartbeat_task
-            
+            self._raise_write_buffer_limits(websocket)
+
+            # The event loop is single-threaded and dict mutations are
+            # atomic under the GIL, so no lock is needed here
+            if len(self.active_connections) >= settings.ws_max_concurrent_connections:
+                logger.warning(
+                    f"Connection limit reached ({settings.ws_max_concurrent_connections})",
+                    extra={"user_id": user_id, "session_id": session_id}
+                )
+                await websocket.close(code=1008, reason="Connection limit reached")
+                raise WebSocketError("Maximum concurrent connections reached")
+
+            # Register connection
+            self.active_connections[session_id] = websocket
+            self.connection_metadata[session_id] = ConnectionMetadata(user_id, session_id)
+
+            # Single-writer queue: a slow client only backs up its own
+            # queue instead of stalling the graph stream on send_text
+            queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_MAXSIZE)
+            self._send_queues[session_id] = queue
+            self._session_suffixes[session_id] = (
+                b',"session_id":' + orjson.dumps(session_id) + b"}"
+            )
+            self._writer_tasks[session_id] = asyncio.create_task(
+                self._writer_loop(session_id, queue)
+            )
+
+            # Route frames published by other workers into this queue
+            if event_bus.enabled:
+                await event_bus.subscribe(session_id, queue)
+
+            # Start the shared heartbeat sweeper if not running
+            if self._heartbeat_task is None or self._heartbeat_task.done():
+                self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
             # Start cleanup task if not running
             if self._cleanup_task is None or self._cleanup_task.done():
                 self._cleanup_task = asyncio.create_task(self._cleanup_loop())
@@ -148,6 +196,28 @@ class ConnectionManager:
             )
             raise WebSocketError(f"Connection failed: {str(e)}") from e
     
+    @staticmethod
+    def _raise_write_buffer_limits(websocket: WebSocket, high: int = 1 << 20) -> None:
+        """
+        Lift the transport write high-water mark for a connection.
+
+        The ASGI backends default to small write buffers, which causes
+        drain stalls between large frames (RESULTS payloads, token
+        batches) on high-RTT links. Best-effort: a no-op on backends
+        that don't expose the transport.
+        """
+        try:
+            transport = None
+            protocol = getattr(websocket, "_protocol", None)
+            if protocol is not None:
+                transport = getattr(protocol, "transport", None)
+            if transport is None and hasattr(websocket, "_send"):
+                transport = getattr(websocket._send.__self__, "transport", None)
+            if transport is not None:
+                transport.set_write_buffer_limits(high=high)
+        except Exception:
+            logger.debug("Could not adjust WebSocket write buffer limits")
+
     async def disconnect(self, session_id: str, reason: str = "Client disconnected") -> None:
         """
         Disconnect and cleanup a WebSocket connection.
@@ -156,22 +226,24 @@ class ConnectionManager:
             session_id: Session identifier
             reason: Disconnection reason for logging
         """
-        async with self._lock:
-            metadata = self.connection_metadata.get(session_id)
-            
-            # Cancel heartbeat task
-            if session_id in self._heartbeat_tasks:
-                self._heartbeat_tasks[session_id].cancel()
-                del self._heartbeat_tasks[session_id]
-            
-            # Remove connection
-            if session_id in self.active_connections:
-                del self.active_connections[session_id]
-            
-            # Remove metadata
-            if session_id in self.connection_metadata:
-                del self.connection_metadata[session_id]
-        
+        # Drop all connection state before the first await: the writer's
+        # error path calls disconnect from inside the writer task, and
+        # cancelling it there would otherwise abort cleanup mid-way and
+        # leak the entry until the stale sweep
+        metadata = self.connection_metadata.pop(session_id, None)
+        self.active_connections.pop(session_id, None)
+        self._send_queues.pop(session_id, None)
+        self._session_suffixes.pop(session_id, None)
+
+        # Stop the writer task; skip the cancel when the writer itself
+        # is the caller, since it is already on its way out
+        writer = self._writer_tasks.pop(session_id, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+        if event_bus.enabled:
+            await event_bus.unsubscribe(session_id)
+
         if metadata:
             logger.info(
                 f"WebSocket connection closed: {reason}",
@@ -204,28 +276,81 @@ class ConnectionManager:
         Returns:
             bool: True if sent successfully, False otherwise
         """
-        if session_id not in self.active_connections:
+        websocket = self.active_connections.get(session_id)
+        if websocket is None:
+            # Socket may be held by another worker: hand the frame to the
+            # pub/sub bus and let the owning worker deliver it
+            if event_bus.enabled:
+                frame = orjson.dumps({
+                    "type": event_type.value,
+                    "data": data,
+                    "timestamp": datetime.utcnow(),
+                    "session_id": session_id
+                }, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z).decode()
+                if await event_bus.publish(session_id, frame) > 0:
+                    return True
             logger.warning(f"Cannot send event: session {session_id} not connected")
             return False
-        
+
+        # Fail fast on half-closed sockets before paying serialization
+        # cost; send would raise anyway during disconnect storms
+        if websocket.application_state != WebSocketState.CONNECTED:
+            return False
+
         try:
-            websocket = self.active_connections[session_id]
             metadata = self.connection_metadata.get(session_id)
-            
-            event = ServerEvent(
-                type=event_type,
-                data=data,
-                timestamp=datetime.utcnow(),
-                session_id=session_id
-            )
-            
-            await websocket.send_json(event.model_dump(mode='json'))
+
+            # Serialize once with orjson instead of building a ServerEvent
+            # and re-serializing through send_json; ServerEvent stays the
+            # documented shape of this payload
+            suffix = self._session_suffixes.get(session_id)
+            if event_type is EventType.TOKEN and suffix is not None:
+                # Token fast path: splice pre-encoded envelope fragments
+                # around the data instead of allocating the outer dict
+                payload = (
+                    b'{"type":"token","data":'
+                    + orjson.dumps(data)
+                    + b',"timestamp":'
+                    + orjson.dumps(datetime.utcnow(), option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+                    + suffix
+                )
+            else:
+                payload = orjson.dumps({
+                    "type": event_type.value,
+                    "data": data,
+                    "timestamp": datetime.utcnow(),
+                    "session_id": session_id
+                }, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+            frame = payload.decode()
+
+            queue = self._send_queues.get(session_id)
+            if queue is None:
+                await websocket.send_text(frame)
+            else:
+                try:
+                    queue.put_nowait(frame)
+                except asyncio.QueueFull:
+                    if event_type is EventType.TOKEN:
+                        # TOKEN is lossy by design — the full text is
+                        # re-emitted in RESULTS — so drop the oldest
+                        # frame rather than stall the graph stream
+                        try:
+                            queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            pass
+                        queue.put_nowait(frame)
+                    else:
+                        await queue.put(frame)
             
             if metadata:
                 metadata.update_activity()
                 metadata.increment_message_count()
             
-            if log_event and event_type not in [EventType.PING, EventType.TOKEN]:
+            if (
+                log_event
+                and event_type not in (EventType.PING, EventType.TOKEN)
+                and logger.isEnabledFor(logging.DEBUG)
+            ):
                 logger.debug(
                     f"Sent WebSocket event: {event_type}",
                     extra={"session_id": session_id, "event_type": event_type}
@@ -265,15 +390,32 @@ class ConnectionManager:
             int: Number of successful sends
         """
         sessions = [
-            session_id for session_id, metadata in self.connection_metadata.items()
+            session_id for session_id, metadata in list(self.connection_metadata.items())
             if metadata.user_id == user_id
         ]
-        
+        if not sessions:
+            return 0
+
+        # Serialize once for the whole fan-out; each writer task drains
+        # its own queue so sends proceed concurrently
+        frame = orjson.dumps({
+            "type": event_type.value,
+            "data": data,
+            "timestamp": datetime.utcnow(),
+            "session_id": None
+        }, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z).decode()
+
         successful_sends = 0
         for session_id in sessions:
-            if await self.send_event(session_id, event_type, data):
+            queue = self._send_queues.get(session_id)
+            if queue is None:
+                continue
+            try:
+                queue.put_nowait(frame)
                 successful_sends += 1
-        
+            except asyncio.QueueFull:
+                logger.warning(f"Send queue full, dropping broadcast for {session_id}")
+
         return successful_sends
     
     def get_user_sessions(self, user_id: str) -> List[str]:
@@ -294,47 +436,102 @@ class ConnectionManager:
     def is_connected(self, session_id: str) -> bool:
         """Check if session is connected."""
         return session_id in self.active_connections
+
+    def get_connections_snapshot(self) -> Dict[str, Dict]:
+        """
+        One-pass snapshot of all connections for the debug endpoint.
+
+        Reads the slotted metadata fields directly and shares a single
+        clock read across rows, instead of four attribute lookups plus a
+        monotonic call per connection.
+        """
+        now = time.monotonic()
+        return {
+            session_id: {
+                "user_id": m.user_id,
+                "connected_at": m.connected_at.isoformat(),
+                "message_count": m.message_count,
+                "duration_seconds": now - m._connected_monotonic,
+            }
+            for session_id, m in list(self.connection_metadata.items())
+        }
     
-    async def _heartbeat_loop(self, session_id: str) -> None:
+    async def _heartbeat_loop(self) -> None:
         """
-        Send periodic heartbeats to keep connection alive.
-        
-        Args:
-            session_id: Session identifier
+        Send periodic heartbeats to all connections from one task.
+
+        A single sweeper replaces the previous task-per-connection
+        design: one timer entry in the loop instead of N, with PINGs
+        pipelined concurrently each tick.
         """
         try:
-            while session_id in self.active_connections:
+            while self.active_connections:
                 await asyncio.sleep(settings.ws_heartbeat_interval)
-                
-                if session_id in self.active_connections:
-                    await self.send_event(
-                        session_id,
-                        EventType.PING,
-                        {"timestamp": datetime.utcnow().isoformat()},
-                        log_event=False
-                    )
-                    
+
+                # The payload is invariant (PING needs neither session_id
+                # nor timestamp — both are implicit on the socket), so the
+                # frame is encoded once at import and shared by every tick
+                await asyncio.gather(
+                    *[
+                        self._send_ping(session_id, _PING_FRAME)
+                        for session_id in list(self.active_connections)
+                    ],
+                    return_exceptions=True
+                )
+
         except asyncio.CancelledError:
-            logger.debug(f"Heartbeat cancelled for session {session_id}")
+            logger.debug("Heartbeat sweeper cancelled")
+        except Exception as e:
+            logger.error(f"Heartbeat sweeper error: {str(e)}", exc_info=True)
+    
+    async def _send_ping(self, session_id: str, frame: str) -> None:
+        """Queue a pre-serialized PING frame for one connection."""
+        queue = self._send_queues.get(session_id)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Client is already backed up; skipping a ping is harmless
+            pass
+
+    async def _writer_loop(self, session_id: str, queue: asyncio.Queue) -> None:
+        """
+        Drain one connection's send queue.
+
+        The single writer serializes all sends to a socket so a slow
+        client applies backpressure to its own queue only.
+        """
+        try:
+            while True:
+                frame = await queue.get()
+                websocket = self.active_connections.get(session_id)
+                if websocket is None:
+                    break
+                await websocket.send_text(frame)
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             logger.error(
-                f"Heartbeat error for session {session_id}: {str(e)}",
+                f"Writer error for session {session_id}: {str(e)}",
                 exc_info=True
             )
-            await self.disconnect(session_id, f"Heartbeat error: {str(e)}")
-    
+            await self.disconnect(session_id, f"Send error: {str(e)}")
+
     async def _cleanup_loop(self) -> None:
         """Periodic cleanup of stale connections."""
         try:
             while True:
                 await asyncio.sleep(60)  # Run cleanup every minute
                 
-                stale_sessions = []
-                async with self._lock:
-                    for session_id, metadata in self.connection_metadata.items():
-                        if metadata.is_stale() or metadata.is_heartbeat_overdue():
-                            stale_sessions.append(session_id)
-                
+                # list() snapshots the dict so disconnects during the
+                # sweep can't invalidate the iteration
+                stale_sessions = [
+                    session_id
+                    for session_id, metadata in list(self.connection_metadata.items())
+                    if metadata.is_stale() or metadata.is_heartbeat_overdue()
+                ]
+
                 for session_id in stale_sessions:
                     logger.warning(f"Closing stale connection: {session_id}")
                     await self.disconnect(session_id, "Stale connection")
@@ -351,7 +548,9 @@ class ConnectionManager:
         """Gracefully shutdown all connections."""
         logger.info(f"Shutting down ConnectionManager ({len(self.active_connections)} active connections)")
         
-        # Cancel cleanup task
+        # Cancel background tasks
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            self._heartbeat_task.cancel()
         if self._cleanup_task and not self._cleanup_task.done():
             self._cleanup_task.cancel()
         
@@ -359,7 +558,9 @@ class ConnectionManager:
         sessions = list(self.active_connections.keys())
         for session_id in sessions:
             await self.disconnect(session_id, "Server shutdown")
-        
+
+        await event_bus.close()
+
         logger.info("ConnectionManager shutdown complete")
 
 
@@ -4,19 +4,58 @@ TalknShop Orchestrator Service - Main Application
 WebSocket-based real-time conversational product search orchestrator.
 """
 
+import asyncio
+import itertools
 import logging
+import secrets
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
+def _install_event_loop_policy() -> str:
+    """
+    Install the fastest available event loop policy.
+
+    Preference order (overridable via TNS_EVENT_LOOP=uringcore|uvloop|asyncio):
+    an io_uring-backed loop on Linux if the optional uringcore package is
+    installed, then uvloop (~2x WebSocket throughput over the selector
+    loop), then the stdlib default.
+    """
+    import os
+
+    preference = os.environ.get("TNS_EVENT_LOOP")
+    candidates = [preference] if preference else ["uringcore", "uvloop"]
+
+    for name in candidates:
+        if name == "asyncio":
+            break
+        try:
+            if name == "uringcore":
+                import uringcore
+                asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+                return "uringcore"
+            if name == "uvloop":
+                import uvloop
+                uvloop.install()
+                return "uvloop"
+        except ImportError:
+            continue
+    return "asyncio"
+
+
+_event_loop_impl = _install_event_loop_policy()
+
 from app.core.config import settings
 from app.core.logging_config import setup_logging
 from app.core.aws_clients import verify_aws_connectivity
 from app.core.errors import map_error_to_http
-from app.models.schemas import HealthResponse
+from app.models.schemas import HealthResponse, SessionResponse
+from app.db.dynamodb import session_repo
+from app.db.session_cache import session_cache
 from app.websocket.manager import manager
+from app.websocket.handler import handle_websocket_messages
 from app.services.media_client import media_client
 from app.services.catalog_client import catalog_client
 
@@ -24,6 +63,12 @@ from app.services.catalog_client import catalog_client
 setup_logging()
 logger = logging.getLogger(__name__)
 
+# Generated session IDs: a per-boot nonce plus a counter is unique across
+# restarts and workers without paying a urandom syscall per connection
+# the way uuid4 does
+_SESSION_BOOT_NONCE = secrets.token_hex(4)
+_session_counter = itertools.count()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,6 +77,7 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"AWS Region: {settings.aws_region}")
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
     
     # Verify AWS connectivity
     aws_status = await verify_aws_connectivity()
@@ -48,6 +94,7 @@ async def lifespan(app: FastAPI):
     await manager.shutdown()
     await media_client.close()
     await catalog_client.close()
+    await session_cache.close()
     logger.info("Shutdown complete")
 
 
@@ -56,7 +103,9 @@ app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="Real-time conversational product search orchestrator with WebSocket support",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # HTTP responses serialize through orjson like the WebSocket frames do
+    default_response_class=ORJSONResponse
 )
 
 # CORS Middleware
@@ -167,41 +216,44 @@ async def websocket_chat_endpoint(websocket: WebSocket):
             "session_id": "sess_123"
         }
     """
-    # Extract parameters
-    session_id = websocket.query_params.get("session_id")
-    user_id = websocket.query_params.get("user_id", "anonymous")
+    # Extract parameters (bind query_params once; the property re-parses
+    # lazily on each access)
+    query_params = websocket.query_params
+    session_id = query_params.get("session_id")
+    user_id = query_params.get("user_id", "anonymous")
     
     # Generate session ID if not provided
     if not session_id:
-        import uuid
-        session_id = f"sess_{uuid.uuid4().hex[:12]}"
+        session_id = f"sess_{_SESSION_BOOT_NONCE}{next(_session_counter):08x}"
     
     logger.info(
         "WebSocket connection request",
         extra={"session_id": session_id, "user_id": user_id}
     )
     
+    # handle_websocket_messages returns normally on a clean client
+    # close, so cleanup lives in finally rather than the except arms
+    reason = "Client disconnected"
     try:
         # Connect and register
         await manager.connect(websocket, session_id, user_id)
-        
-        # Import here to avoid circular imports
-        from app.websocket.handler import handle_websocket_messages
-        
+
         # Handle messages
         await handle_websocket_messages(websocket, session_id, user_id)
-        
+
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected normally: {session_id}")
-        await manager.disconnect(session_id, "Client disconnected")
-    
+
     except Exception as e:
         logger.error(
             f"WebSocket error: {str(e)}",
             extra={"session_id": session_id},
             exc_info=True
         )
-        await manager.disconnect(session_id, f"Error: {str(e)}")
+        reason = f"Error: {str(e)}"
+
+    finally:
+        await manager.disconnect(session_id, reason)
 
 
 # =============================================================================
@@ -215,9 +267,6 @@ async def get_session_info(session_id: str):
     
     Returns current session state and connection status.
     """
-    from app.db.dynamodb import session_repo
-    from app.models.schemas import SessionResponse
-    
     session = await session_repo.get_session(session_id)
     if not session:
         return JSONResponse(
@@ -225,7 +274,9 @@ async def get_session_info(session_id: str):
             content={"error": "Session not found"}
         )
     
-    return SessionResponse(
+    # Inputs are already validated (session is a parsed SessionState, the
+    # rest are locals), so skip re-validation with model_construct
+    return SessionResponse.model_construct(
         session=session,
         active=manager.is_connected(session_id),
         connection_count=len(manager.get_user_sessions(session.user_id))
@@ -242,15 +293,7 @@ if settings.debug:
         """Debug endpoint to view active connections."""
         return {
             "total_connections": manager.get_connection_count(),
-            "connections": {
-                session_id: {
-                    "user_id": metadata.user_id,
-                    "connected_at": metadata.connected_at.isoformat(),
-                    "message_count": metadata.message_count,
-                    "duration_seconds": metadata.get_connection_duration()
-                }
-                for session_id, metadata in manager.connection_metadata.items()
-            }
+            "connections": manager.get_connections_snapshot()
         }
 
 
@@ -260,5 +303,14 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
-        log_level=settings.log_level.lower()
+        log_level=settings.log_level.lower(),
+        # uvloop is installed as the loop policy at import time above;
+        # "auto" keeps that choice and falls back cleanly off-Linux
+        loop="auto",
+        http="httptools",
+        # permessage-deflate shrinks large RESULTS frames 5-10x; the
+        # websockets backend supports it (wsproto does not)
+        ws="websockets",
+        ws_per_message_deflate=True,
+        ws_max_size=16 * 1024 * 1024
     )
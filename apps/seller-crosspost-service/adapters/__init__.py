@@ -12,12 +12,15 @@ from .base_adapter import BaseMarketplaceAdapter
 from .ebay_adapter import EbayAdapter
 from .craigslist_adapter import CraigslistAdapter
 from .facebook_adapter import FacebookAdapter
+from .http_client import get_http_client, close_http_client
 
 __all__ = [
     'BaseMarketplaceAdapter',
     'EbayAdapter',
     'CraigslistAdapter',
     'FacebookAdapter',
+    'get_http_client',
+    'close_http_client',
 ]
 
 
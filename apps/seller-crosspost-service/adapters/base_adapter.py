@@ -6,7 +6,49 @@ All marketplace adapters must implement this interface.
 
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
+import os
+import secrets
+import time
+
+import httpx
+
+from .http_client import get_http_client
+
+# Generic condition -> marketplace condition; built once at import so
+# _map_condition is a single dict.get per call
+_CONDITION_MAP = {
+    "new": "NEW",
+    "like_new": "LIKE_NEW",
+    "good": "GOOD",
+    "fair": "FAIR",
+    "poor": "POOR"
+}
+
+# The mock post_listing implementations simulate marketplace API latency;
+# disable outside development so deployed builds don't sleep 1-2s per post
+_SIMULATE_API_DELAY = os.environ.get("ENVIRONMENT", "development") == "development"
+
+# 1-second-resolution cache for ISO timestamps: (epoch second, string)
+_iso_now_cache = (0, "")
+
+
+def _iso_now() -> str:
+    """
+    Return the current UTC time as an ISO string, cached per second.
+
+    Adapters stamp every post/status call; datetime.utcnow().isoformat()
+    is surprisingly heavy, and second resolution is plenty for these
+    near-instant timestamps.
+    """
+    global _iso_now_cache
+    now = int(time.time())
+    cached_second, cached_value = _iso_now_cache
+    if now != cached_second:
+        cached_value = datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
+        _iso_now_cache = (now, cached_value)
+    return cached_value
 
 
 class BaseMarketplaceAdapter(ABC):
@@ -22,7 +64,16 @@ class BaseMarketplaceAdapter(ABC):
         """
         self.api_key = api_key
         self.credentials = kwargs
-    
+        # Cache the marketplace limits as plain attributes so the
+        # per-listing helpers don't re-invoke the property descriptors
+        self._max_title_len = self.max_title_length
+        self._max_images = self.max_images
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP/2 client for marketplace API calls."""
+        return get_http_client()
+
     @property
     @abstractmethod
     def marketplace_name(self) -> str:
@@ -160,30 +211,42 @@ class BaseMarketplaceAdapter(ABC):
         """
         pass
     
+    def _iso_now(self) -> str:
+        """Current UTC time as an ISO string (second-resolution cache)."""
+        return _iso_now()
+
+    async def _simulate_api_delay(self, seconds: float) -> None:
+        """Sleep to mimic marketplace API latency, development only."""
+        if _SIMULATE_API_DELAY:
+            await asyncio.sleep(seconds)
+
+    def _new_listing_id(self, prefix: str) -> str:
+        """
+        Generate a marketplace listing ID.
+
+        Millisecond timestamp plus a random suffix: unlike the old
+        second-resolution epoch, two posts landing in the same second
+        can't collide.
+        """
+        return f"{prefix}_{time.time_ns() // 1_000_000:x}{secrets.token_hex(2)}"
+
     def _map_condition(self, condition: str) -> str:
         """
         Map generic condition to marketplace-specific condition.
         
         Override in subclass if needed.
         """
-        condition_map = {
-            "new": "NEW",
-            "like_new": "LIKE_NEW",
-            "good": "GOOD",
-            "fair": "FAIR",
-            "poor": "POOR"
-        }
-        return condition_map.get(condition.lower(), "USED")
+        return _CONDITION_MAP.get(condition.lower(), "USED")
     
     def _truncate_title(self, title: str) -> str:
         """Truncate title to marketplace maximum."""
-        if len(title) <= self.max_title_length:
-            return title
-        return title[:self.max_title_length - 3] + "..."
+        max_len = self._max_title_len
+        return title if len(title) <= max_len else title[:max_len - 3] + "..."
     
     def _limit_images(self, image_urls: list) -> list:
         """Limit images to marketplace maximum."""
-        return image_urls[:self.max_images]
+        max_images = self._max_images
+        return image_urls if len(image_urls) <= max_images else image_urls[:max_images]
 
 
 
@@ -6,12 +6,19 @@ Handles Craigslist-specific listing transformation and API integration.
 
 import logging
 from typing import Dict, Any
-from datetime import datetime
 
 from .base_adapter import BaseMarketplaceAdapter
 
 logger = logging.getLogger(__name__)
 
+# Category mapping built once at import instead of per transform call
+_CATEGORY_MAP = {
+    "Electronics > Smartphones": "mob",
+    "Electronics > Laptops": "sys",
+    "Electronics > Monitors": "ele",
+    # ... more categories
+}
+
 
 class CraigslistAdapter(BaseMarketplaceAdapter):
     """Craigslist marketplace posting adapter."""
@@ -80,16 +87,15 @@ class CraigslistAdapter(BaseMarketplaceAdapter):
             logger.info(f"Posting to Craigslist: {marketplace_payload.get('posting_title')}")
             
             # Simulate API delay
-            import asyncio
-            await asyncio.sleep(1.5)
+            await self._simulate_api_delay(1.5)
             
-            listing_id = f"cl_{int(datetime.utcnow().timestamp())}"
+            listing_id = self._new_listing_id("cl")
             
             return {
                 "success": True,
                 "listing_id": listing_id,
                 "confirmation_link": f"https://sfbay.craigslist.org/sfc/mob/d/{listing_id}.html",
-                "posted_at": datetime.utcnow().isoformat()
+                "posted_at": self._iso_now()
             }
         except Exception as e:
             logger.error(f"Craigslist posting failed: {e}")
@@ -104,7 +110,7 @@ class CraigslistAdapter(BaseMarketplaceAdapter):
         return {
             "listing_id": listing_id,
             "status": "live",
-            "last_updated": datetime.utcnow().isoformat()
+            "last_updated": self._iso_now()
         }
     
     async def update_listing(self, listing_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
@@ -117,13 +123,7 @@ class CraigslistAdapter(BaseMarketplaceAdapter):
     
     def _map_category_to_craigslist(self, generic_category: str) -> str:
         """Map generic category to Craigslist category slug."""
-        category_map = {
-            "Electronics > Smartphones": "mob",
-            "Electronics > Laptops": "sys",
-            "Electronics > Monitors": "ele",
-            # ... more categories
-        }
-        return category_map.get(generic_category, "for")  # Default: for sale
+        return _CATEGORY_MAP.get(generic_category, "for")  # Default: for sale
 
 
 
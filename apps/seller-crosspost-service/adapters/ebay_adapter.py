@@ -4,15 +4,32 @@ eBay marketplace posting adapter.
 Handles eBay-specific listing transformation and API integration.
 """
 
+import asyncio
 import logging
 from typing import Dict, Any, Optional
-import httpx
-from datetime import datetime
 
 from .base_adapter import BaseMarketplaceAdapter
 
 logger = logging.getLogger(__name__)
 
+# Category/condition mappings built once at import; transform_listing
+# runs per listing per marketplace, so these reduce to a dict.get
+# TODO: Implement proper category mapping via eBay's category taxonomy
+_CATEGORY_MAP = {
+    "Electronics > Smartphones": "9355",
+    "Electronics > Laptops": "177",
+    "Electronics > Monitors": "80053",
+    # ... many more categories
+}
+
+_CONDITION_ID_MAP = {
+    "new": 1000,
+    "like_new": 1500,
+    "good": 3000,
+    "fair": 4000,
+    "poor": 5000
+}
+
 
 class EbayAdapter(BaseMarketplaceAdapter):
     """eBay marketplace posting adapter."""
@@ -91,17 +108,12 @@ class EbayAdapter(BaseMarketplaceAdapter):
         """Transform to eBay listing format."""
         
         # Map generic category to eBay category ID
-        # TODO: Implement proper category mapping
         ebay_category_id = self._map_category_to_ebay(listing_spec.get("category", ""))
-        
+
         # Map condition
-        ebay_condition = {
-            "new": 1000,
-            "like_new": 1500,
-            "good": 3000,
-            "fair": 4000,
-            "poor": 5000
-        }.get(listing_spec.get("condition", "").lower(), 3000)
+        ebay_condition = _CONDITION_ID_MAP.get(
+            listing_spec.get("condition", "").lower(), 3000
+        )
         
         payload = {
             "Title": self._truncate_title(listing_spec["title"]),
@@ -124,26 +136,28 @@ class EbayAdapter(BaseMarketplaceAdapter):
         return payload
     
     async def upload_images(self, s3_keys: list) -> list:
-        """Upload images to eBay CDN."""
-        ebay_image_urls = []
-        
-        for s3_key in self._limit_images(s3_keys):
-            try:
-                # TODO: Implement actual image upload to eBay
-                # 1. Download from S3
-                # 2. Upload to eBay's image server
-                # 3. Get eBay image URL
-                
-                # Mock for now
-                ebay_url = f"https://i.ebayimg.com/images/{s3_key.split('/')[-1]}"
-                ebay_image_urls.append(ebay_url)
-                
-                logger.info(f"Uploaded image to eBay: {ebay_url}")
-                
-            except Exception as e:
-                logger.error(f"Failed to upload image {s3_key}: {e}")
-        
-        return ebay_image_urls
+        """Upload images to eBay CDN, all uploads in flight at once."""
+        results = await asyncio.gather(
+            *[self._upload_one(s3_key) for s3_key in self._limit_images(s3_keys)]
+        )
+        return [url for url in results if url is not None]
+
+    async def _upload_one(self, s3_key: str) -> Optional[str]:
+        """Upload a single image; returns its eBay URL or None on failure."""
+        try:
+            # TODO: Implement actual image upload to eBay
+            # 1. Download from S3
+            # 2. Upload to eBay's image server
+            # 3. Get eBay image URL
+
+            # Mock for now
+            ebay_url = f"https://i.ebayimg.com/images/{s3_key.split('/')[-1]}"
+            logger.info(f"Uploaded image to eBay: {ebay_url}")
+            return ebay_url
+
+        except Exception as e:
+            logger.error(f"Failed to upload image {s3_key}: {e}")
+            return None
     
     async def post_listing(self, marketplace_payload: Dict[str, Any]) -> Dict[str, Any]:
         """Post listing to eBay API."""
@@ -154,17 +168,16 @@ class EbayAdapter(BaseMarketplaceAdapter):
             logger.info(f"Posting to eBay: {marketplace_payload.get('Title')}")
             
             # Simulate API call delay (eBay takes 8-12 seconds)
-            import asyncio
-            await asyncio.sleep(2)  # Reduced for testing
+            await self._simulate_api_delay(2)  # Reduced for testing
             
             # Mock success response
-            listing_id = f"ebay_{int(datetime.utcnow().timestamp())}"
+            listing_id = self._new_listing_id("ebay")
             
             return {
                 "success": True,
                 "listing_id": listing_id,
                 "confirmation_link": f"https://www.ebay.com/itm/{listing_id}",
-                "posted_at": datetime.utcnow().isoformat()
+                "posted_at": self._iso_now()
             }
             
         except Exception as e:
@@ -183,7 +196,7 @@ class EbayAdapter(BaseMarketplaceAdapter):
                 "listing_id": listing_id,
                 "status": "live",
                 "views": 0,
-                "last_updated": datetime.utcnow().isoformat()
+                "last_updated": self._iso_now()
             }
         except Exception as e:
             logger.error(f"Failed to get eBay status: {e}")
@@ -205,15 +218,7 @@ class EbayAdapter(BaseMarketplaceAdapter):
     
     def _map_category_to_ebay(self, generic_category: str) -> str:
         """Map generic category to eBay category ID."""
-        # TODO: Implement proper category mapping
-        # This would use eBay's category taxonomy
-        category_map = {
-            "Electronics > Smartphones": "9355",
-            "Electronics > Laptops": "177",
-            "Electronics > Monitors": "80053",
-            # ... many more categories
-        }
-        return category_map.get(generic_category, "99999")  # Default category
+        return _CATEGORY_MAP.get(generic_category, "99999")  # Default category
     
     def _build_shipping_details(self, listing_spec: Dict[str, Any]) -> Dict[str, Any]:
         """Build eBay shipping details."""
@@ -6,12 +6,26 @@ Handles Facebook-specific listing transformation and API integration.
 
 import logging
 from typing import Dict, Any
-from datetime import datetime
 
 from .base_adapter import BaseMarketplaceAdapter
 
 logger = logging.getLogger(__name__)
 
+# Category/condition mappings built once at import instead of per call
+_CATEGORY_MAP = {
+    "Electronics > Smartphones": "219",
+    "Electronics > Laptops": "190",
+    # ... more categories
+}
+
+_CONDITION_MAP = {
+    "new": "NEW",
+    "like_new": "LIKE_NEW",
+    "good": "GOOD",
+    "fair": "FAIR",
+    "poor": "POOR"
+}
+
 
 class FacebookAdapter(BaseMarketplaceAdapter):
     """Facebook Marketplace posting adapter."""
@@ -81,16 +95,15 @@ class FacebookAdapter(BaseMarketplaceAdapter):
             logger.info(f"Posting to Facebook: {marketplace_payload.get('name')}")
             
             # Simulate API delay
-            import asyncio
-            await asyncio.sleep(1)
+            await self._simulate_api_delay(1)
             
-            listing_id = f"fb_{int(datetime.utcnow().timestamp())}"
+            listing_id = self._new_listing_id("fb")
             
             return {
                 "success": True,
                 "listing_id": listing_id,
                 "confirmation_link": f"https://www.facebook.com/marketplace/item/{listing_id}",
-                "posted_at": datetime.utcnow().isoformat(),
+                "posted_at": self._iso_now(),
                 "status": "pending_review"  # Facebook often requires review
             }
         except Exception as e:
@@ -107,7 +120,7 @@ class FacebookAdapter(BaseMarketplaceAdapter):
             "listing_id": listing_id,
             "status": "live",
             "views": 0,
-            "last_updated": datetime.utcnow().isoformat()
+            "last_updated": self._iso_now()
         }
     
     async def update_listing(self, listing_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
@@ -120,23 +133,11 @@ class FacebookAdapter(BaseMarketplaceAdapter):
     
     def _map_condition_facebook(self, condition: str) -> str:
         """Map condition to Facebook values."""
-        condition_map = {
-            "new": "NEW",
-            "like_new": "LIKE_NEW",
-            "good": "GOOD",
-            "fair": "FAIR",
-            "poor": "POOR"
-        }
-        return condition_map.get(condition.lower(), "USED")
-    
+        return _CONDITION_MAP.get(condition.lower(), "USED")
+
     def _map_category_to_facebook(self, generic_category: str) -> str:
         """Map generic category to Facebook category ID."""
-        category_map = {
-            "Electronics > Smartphones": "219",
-            "Electronics > Laptops": "190",
-            # ... more categories
-        }
-        return category_map.get(generic_category, "1")  # Default
+        return _CATEGORY_MAP.get(generic_category, "1")  # Default
     
     def _map_shipping_options(self, options: list) -> list:
         """Map shipping options to Facebook format."""
@@ -0,0 +1,43 @@
+"""
+Shared HTTP client for marketplace adapters.
+
+All adapters post to external HTTPS APIs; a single long-lived client
+with HTTP/2 and connection pooling amortizes TLS handshakes across
+listings instead of paying one per request.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None:
+        limits = httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=100
+        )
+        try:
+            _client = httpx.AsyncClient(http2=True, limits=limits, timeout=30.0)
+        except ImportError:
+            # h2 not installed (httpx[http2] extra); HTTP/1.1 still pools
+            logger.warning("h2 package not installed, falling back to HTTP/1.1")
+            _client = httpx.AsyncClient(limits=limits, timeout=30.0)
+        logger.info("Shared marketplace HTTP client initialized")
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client during application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Shared marketplace HTTP client closed")
@@ -0,0 +1,76 @@
+"""
+Cross-posting pipeline for marketplace adapters.
+
+Runs the validate -> transform -> upload images -> post pipeline for
+every target marketplace concurrently. Each adapter hits an independent
+API, so total latency is the slowest marketplace rather than the sum.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from adapters import BaseMarketplaceAdapter
+
+logger = logging.getLogger(__name__)
+
+
+async def post_to_marketplace(
+    adapter: BaseMarketplaceAdapter,
+    listing_spec: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Post a listing to a single marketplace.
+
+    Returns the adapter's post result with the marketplace name attached;
+    validation failures short-circuit before any upload.
+    """
+    validation = await adapter.validate_listing(listing_spec)
+    if not validation["valid"]:
+        return {
+            "success": False,
+            "marketplace": adapter.marketplace_name,
+            "error": "; ".join(validation["errors"]),
+            "error_code": "VALIDATION_ERROR"
+        }
+
+    payload = await adapter.transform_listing(listing_spec)
+    payload["image_urls"] = await adapter.upload_images(
+        listing_spec.get("media_s3_keys", [])
+    )
+
+    result = await adapter.post_listing(payload)
+    result["marketplace"] = adapter.marketplace_name
+    return result
+
+
+async def post_to_marketplaces(
+    adapters: List[BaseMarketplaceAdapter],
+    listing_spec: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Post a listing to all marketplaces concurrently.
+
+    One slow or failing marketplace doesn't delay or abort the others;
+    exceptions are folded into per-marketplace error results.
+    """
+    results = await asyncio.gather(
+        *[post_to_marketplace(adapter, listing_spec) for adapter in adapters],
+        return_exceptions=True
+    )
+
+    normalized = []
+    for adapter, result in zip(adapters, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                f"{adapter.marketplace_name} posting raised: {result}",
+                exc_info=result
+            )
+            result = {
+                "success": False,
+                "marketplace": adapter.marketplace_name,
+                "error": str(result),
+                "error_code": "ADAPTER_ERROR"
+            }
+        normalized.append(result)
+    return normalized
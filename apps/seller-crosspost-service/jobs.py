@@ -0,0 +1,265 @@
+"""
+SQS dispatch and DynamoDB job records for cross-posting.
+
+Marketplace jobs are fanned out in batches: SendMessageBatch collapses up
+to 10 SQS messages into one HTTP round-trip and BatchWriteItem does the
+same for up to 25 job records, so job creation costs O(ceil(N/10)) calls
+instead of one per marketplace. Disabled transparently when aioboto3 is
+not installed or no queue URLs are configured, in which case post_listing
+keeps its mock behavior.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Optional dependency: dispatch is a no-op without it
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+# Optional: DAX accelerates the read-heavy job-status polling pattern
+# (dashboards poll every few seconds per active job) to microseconds
+try:
+    import amazondax
+except ImportError:
+    amazondax = None
+
+try:
+    from boto3.dynamodb.conditions import Key
+except ImportError:
+    Key = None
+
+logger = logging.getLogger(__name__)
+
+SQS_BATCH_MAX = 10
+DDB_BATCH_MAX = 25
+DDB_RETRY_ATTEMPTS = 3
+
+# One queue per marketplace, mirroring env.example
+_QUEUE_URL_VARS = {
+    "ebay": "SQS_EBAY_QUEUE_URL",
+    "craigslist": "SQS_CRAIGSLIST_QUEUE_URL",
+    "facebook": "SQS_FACEBOOK_QUEUE_URL",
+}
+
+
+def _chunked(items: list, size: int) -> list:
+    """Split a list into chunks of at most `size`."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class JobDispatcher:
+    """Batched SQS enqueue and DynamoDB writes for marketplace jobs."""
+
+    def __init__(self):
+        self._queue_urls = {
+            marketplace: url
+            for marketplace, env_var in _QUEUE_URL_VARS.items()
+            if (url := os.getenv(env_var))
+        }
+        self._jobs_table = os.getenv("DYNAMODB_JOBS_TABLE", "seller-crosspost-jobs")
+        self._dax_endpoint = os.getenv("DAX_ENDPOINT")
+        self._dax_table = None
+        self._session = aioboto3.Session() if aioboto3 is not None else None
+        # Long-lived clients entered by open(); per-call clients are the
+        # fallback so the dispatcher also works outside the app lifespan
+        self._stack: Optional[AsyncExitStack] = None
+        self._sqs = None
+        self._ddb = None
+        if self.enabled:
+            logger.info(
+                "Job dispatcher enabled for marketplaces: %s",
+                sorted(self._queue_urls)
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether SQS dispatch is configured."""
+        return self._session is not None and bool(self._queue_urls)
+
+    async def open(self) -> None:
+        """
+        Create long-lived SQS and DynamoDB clients.
+
+        Called once from the app lifespan: client construction resolves
+        credentials and region (~10ms of SDK cold-init) that should not
+        be paid on the first post_listing request.
+        """
+        if not self.enabled or self._stack is not None:
+            return
+        stack = AsyncExitStack()
+        self._sqs = await stack.enter_async_context(self._session.client("sqs"))
+        self._ddb = await stack.enter_async_context(self._session.resource("dynamodb"))
+        self._stack = stack
+        # Warm DNS + TLS so the first real request skips the handshake
+        try:
+            await self._ddb.meta.client.describe_endpoints()
+        except Exception:
+            logger.debug("DynamoDB endpoint warm-up failed")
+
+    async def close(self) -> None:
+        """Release the clients created by open()."""
+        if self._stack is not None:
+            await self._stack.aclose()
+            self._stack = None
+            self._sqs = None
+            self._ddb = None
+
+    async def dispatch(
+        self,
+        job_id: str,
+        user_id: str,
+        listing_spec: Dict[str, Any],
+        marketplace_jobs: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Enqueue marketplace jobs and persist their records.
+
+        SQS sends and the DynamoDB batch write all run concurrently; a
+        marketplace without a configured queue is skipped with a warning.
+        """
+        # Group messages by destination queue so each queue gets batched
+        # SendMessageBatch calls instead of one send_message per job
+        by_queue: Dict[str, List[Dict[str, Any]]] = {}
+        for job in marketplace_jobs:
+            queue_url = self._queue_urls.get(job["marketplace"])
+            if queue_url is None:
+                logger.warning("No SQS queue configured for %s", job["marketplace"])
+                continue
+            by_queue.setdefault(queue_url, []).append(job)
+
+        if self._sqs is not None:
+            await self._dispatch_with(self._sqs, self._ddb, by_queue, job_id,
+                                      user_id, listing_spec, marketplace_jobs)
+            return
+
+        async with self._session.client("sqs") as sqs, \
+                self._session.resource("dynamodb") as dynamodb:
+            await self._dispatch_with(sqs, dynamodb, by_queue, job_id,
+                                      user_id, listing_spec, marketplace_jobs)
+
+    async def _dispatch_with(
+        self,
+        sqs,
+        dynamodb,
+        by_queue: Dict[str, List[Dict[str, Any]]],
+        job_id: str,
+        user_id: str,
+        listing_spec: Dict[str, Any],
+        marketplace_jobs: List[Dict[str, Any]]
+    ) -> None:
+        """Run the batched sends and the record write concurrently."""
+        coros = [
+            self._send_batch(sqs, queue_url, job_id, user_id, listing_spec, chunk)
+            for queue_url, jobs in by_queue.items()
+            for chunk in _chunked(jobs, SQS_BATCH_MAX)
+        ]
+        coros.append(self._write_job_records(dynamodb, job_id, marketplace_jobs))
+        await asyncio.gather(*coros)
+
+    async def get_job_records(self, job_id: str) -> List[Dict[str, Any]]:
+        """
+        Fetch all marketplace job records for a job.
+
+        Reads go through DAX when DAX_ENDPOINT is configured (cached
+        single-key reads in microseconds vs milliseconds from DynamoDB);
+        otherwise they fall back to a direct DynamoDB query.
+        """
+        condition = Key("job_id").eq(job_id)
+
+        if amazondax is not None and self._dax_endpoint:
+            if self._dax_table is None:
+                self._dax_table = amazondax.AmazonDaxClient.resource(
+                    endpoint_url=self._dax_endpoint
+                ).Table(self._jobs_table)
+            # The DAX client is synchronous; keep it off the event loop
+            response = await asyncio.to_thread(
+                self._dax_table.query, KeyConditionExpression=condition
+            )
+            return response.get("Items", [])
+
+        if self._ddb is not None:
+            table = await self._ddb.Table(self._jobs_table)
+            response = await table.query(KeyConditionExpression=condition)
+            return response.get("Items", [])
+
+        async with self._session.resource("dynamodb") as dynamodb:
+            table = await dynamodb.Table(self._jobs_table)
+            response = await table.query(KeyConditionExpression=condition)
+            return response.get("Items", [])
+
+    async def _send_batch(
+        self,
+        sqs,
+        queue_url: str,
+        job_id: str,
+        user_id: str,
+        listing_spec: Dict[str, Any],
+        jobs: List[Dict[str, Any]]
+    ) -> None:
+        """Send up to SQS_BATCH_MAX jobs to one queue in a single call."""
+        entries = [
+            {
+                "Id": str(i),
+                "MessageBody": json.dumps({
+                    "job_id": job_id,
+                    "marketplace_job_id": job["job_id"],
+                    "marketplace": job["marketplace"],
+                    "user_id": user_id,
+                    "listing_spec": listing_spec,
+                }),
+            }
+            for i, job in enumerate(jobs)
+        ]
+        response = await sqs.send_message_batch(QueueUrl=queue_url, Entries=entries)
+        for failure in response.get("Failed", []):
+            logger.error(
+                "SQS batch entry failed: %s (%s)",
+                failure.get("Id"), failure.get("Message")
+            )
+
+    async def _write_job_records(
+        self,
+        dynamodb,
+        job_id: str,
+        marketplace_jobs: List[Dict[str, Any]]
+    ) -> None:
+        """Persist job records with BatchWriteItem, retrying unprocessed."""
+        created_at = datetime.now(timezone.utc).isoformat()
+        items = [
+            {
+                "PutRequest": {
+                    "Item": {
+                        "job_id": job_id,
+                        "marketplace_job_id": job["job_id"],
+                        "marketplace": job["marketplace"],
+                        "status": job["status"],
+                        "created_at": created_at,
+                    }
+                }
+            }
+            for job in marketplace_jobs
+        ]
+
+        for chunk in _chunked(items, DDB_BATCH_MAX):
+            request_items = {self._jobs_table: chunk}
+            for attempt in range(DDB_RETRY_ATTEMPTS):
+                response = await dynamodb.batch_write_item(RequestItems=request_items)
+                request_items = response.get("UnprocessedItems") or {}
+                if not request_items:
+                    break
+                # Exponential backoff before retrying throttled writes
+                await asyncio.sleep(0.1 * (2 ** attempt))
+            if request_items:
+                logger.error("DynamoDB left %d job records unprocessed",
+                             sum(len(v) for v in request_items.values()))
+
+
+# Global job dispatcher instance
+job_dispatcher = JobDispatcher()
@@ -4,14 +4,21 @@ Seller Crosspost Service - Main Application
 FastAPI service for asynchronous multi-marketplace listing posting.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
+import os
+import time
 import uvicorn
 
+from adapters import close_http_client
+from jobs import job_dispatcher
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,11 +26,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 1-second-resolution cache for response timestamps: post_listing stamps
+# up to five fields per request, and datetime allocation plus isoformat
+# dominates these trivial handlers
+_iso_cache = [0, ""]
+
+
+def iso_now() -> str:
+    """Current UTC time as an offset-aware ISO string, cached per second."""
+    now = int(time.time())
+    if now != _iso_cache[0]:
+        _iso_cache[0] = now
+        # datetime.utcnow()/utcfromtimestamp() are deprecated since 3.12
+        # and produce naive datetimes; emit an explicit +00:00 offset
+        _iso_cache[1] = datetime.fromtimestamp(now, tz=timezone.utc).isoformat()
+    return _iso_cache[1]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own the AWS clients and HTTP pool for the app's lifetime."""
+    logger.info("=== Seller Crosspost Service Starting ===")
+    logger.info("Service: TalknShop Seller Crosspost")
+    logger.info("Version: 1.0.0")
+    logger.info("Port: 8003")
+
+    # Construct the SQS/DynamoDB clients once: credential and region
+    # resolution is ~10ms of SDK cold-init that shouldn't land on the
+    # first post_listing request
+    await job_dispatcher.open()
+
+    logger.info("=== Service Ready ===")
+    yield
+
+    logger.info("=== Seller Crosspost Service Shutting Down ===")
+    await job_dispatcher.close()
+    await close_http_client()
+    logger.info("=== Shutdown Complete ===")
+
+
 # Create FastAPI app
 app = FastAPI(
     title="TalknShop Seller Crosspost Service",
     description="Asynchronous multi-marketplace listing service",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -40,6 +87,7 @@ app.add_middleware(
 
 class Location(BaseModel):
     """Listing location."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     city: str
     state: str
     zip: str
@@ -47,6 +95,7 @@ class Location(BaseModel):
 
 class ListingSpec(BaseModel):
     """Product listing specification."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     title: str
     description: str
     price: float
@@ -62,6 +111,7 @@ class ListingSpec(BaseModel):
 
 class PostListingRequest(BaseModel):
     """Request to post a listing."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     listing_spec: ListingSpec
     user_id: str
     session_id: str
@@ -69,6 +119,7 @@ class PostListingRequest(BaseModel):
 
 class MarketplaceJob(BaseModel):
     """Marketplace-specific job status."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     marketplace: str
     job_id: str
     status: str
@@ -76,6 +127,7 @@ class MarketplaceJob(BaseModel):
 
 class PostListingResponse(BaseModel):
     """Response for posting job creation."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     job_id: str
     status: str
     created_at: str
@@ -85,6 +137,7 @@ class PostListingResponse(BaseModel):
 
 class MarketplaceResult(BaseModel):
     """Result from a specific marketplace."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     marketplace: str
     status: str
     listing_id: Optional[str] = None
@@ -96,6 +149,7 @@ class MarketplaceResult(BaseModel):
 
 class JobStatusResponse(BaseModel):
     """Job status response."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
     job_id: str
     status: str
     created_at: str
@@ -112,7 +166,7 @@ async def health_check():
         "status": "healthy",
         "service": "seller-crosspost-service",
         "version": "1.0.0",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 
@@ -132,36 +186,45 @@ async def post_listing(request: PostListingRequest):
     
     Processing is asynchronous - workers will process the listing and update status.
     """
-    logger.info(f"Received posting request from user {request.user_id}")
+    logger.info("Received posting request from user %s", request.user_id)
     
     try:
-        # TODO: Implement actual job creation logic
-        # 1. Validate listing
-        # 2. Create job in DynamoDB
-        # 3. Create SQS messages for each marketplace
-        # 4. Return job_id
-        
-        # Mock response for now
-        job_id = f"job_{datetime.utcnow().timestamp()}"
+        # One clock read for the whole request instead of a datetime
+        # allocation per marketplace job
+        now_ns = time.time_ns()
+        job_id = f"job_{now_ns}"
+        # model_construct skips validation: every field here is
+        # server-generated (marketplace names come from the already
+        # validated request body), so there is nothing to coerce
         marketplace_jobs = [
-            MarketplaceJob(
+            MarketplaceJob.model_construct(
                 marketplace=mp,
-                job_id=f"{mp}_{datetime.utcnow().timestamp()}",
+                job_id=f"{mp}_{now_ns}",
                 status="queued"
             )
             for mp in request.listing_spec.target_marketplaces
         ]
-        
-        return PostListingResponse(
+
+        # Enqueue marketplace jobs (batched SQS sends + one DynamoDB
+        # batch write); without queue config this stays a mock response
+        if job_dispatcher.enabled:
+            await job_dispatcher.dispatch(
+                job_id=job_id,
+                user_id=request.user_id,
+                listing_spec=request.listing_spec.model_dump(),
+                marketplace_jobs=[job.model_dump() for job in marketplace_jobs]
+            )
+
+        return PostListingResponse.model_construct(
             job_id=job_id,
             status="processing",
-            created_at=datetime.utcnow().isoformat(),
+            created_at=iso_now(),
             marketplace_jobs=marketplace_jobs,
             estimated_completion="2-5 minutes"
         )
         
     except Exception as e:
-        logger.error(f"Error posting listing: {e}", exc_info=True)
+        logger.error("Error posting listing: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create posting job: {str(e)}"
@@ -178,37 +241,60 @@ async def get_job_status(job_id: str):
     
     Returns current status and results from all marketplaces.
     """
-    logger.info(f"Status check for job {job_id}")
+    logger.info("Status check for job %s", job_id)
     
     try:
-        # TODO: Implement actual status retrieval from DynamoDB
-        
+        # Real job records when AWS is configured (DAX-cached reads when
+        # DAX_ENDPOINT is set); otherwise fall through to the mock below
+        if job_dispatcher.enabled:
+            records = await job_dispatcher.get_job_records(job_id)
+            if records:
+                statuses = {record["status"] for record in records}
+                done = statuses <= {"live", "failed"}
+                return JobStatusResponse(
+                    job_id=job_id,
+                    status="completed" if done else "processing",
+                    created_at=min(r["created_at"] for r in records),
+                    completed_at=iso_now() if done else None,
+                    marketplace_results=[
+                        MarketplaceResult(
+                            marketplace=record["marketplace"],
+                            status=record["status"],
+                            listing_id=record.get("listing_id"),
+                            confirmation_link=record.get("confirmation_link"),
+                            posted_at=record.get("posted_at")
+                        )
+                        for record in records
+                    ]
+                )
+
         # Mock response for now
+        now_iso = iso_now()
         return JobStatusResponse(
             job_id=job_id,
             status="completed",
-            created_at=datetime.utcnow().isoformat(),
-            completed_at=datetime.utcnow().isoformat(),
+            created_at=now_iso,
+            completed_at=now_iso,
             marketplace_results=[
                 MarketplaceResult(
                     marketplace="ebay",
                     status="live",
                     listing_id="123456789",
                     confirmation_link="https://ebay.com/itm/123456789",
-                    posted_at=datetime.utcnow().isoformat()
+                    posted_at=now_iso
                 ),
                 MarketplaceResult(
                     marketplace="craigslist",
                     status="live",
                     listing_id="cl_abc123",
                     confirmation_link="https://craigslist.org/listing/abc123",
-                    posted_at=datetime.utcnow().isoformat()
+                    posted_at=now_iso
                 )
             ]
         )
         
     except Exception as e:
-        logger.error(f"Error retrieving job status: {e}", exc_info=True)
+        logger.error("Error retrieving job status: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve job status: {str(e)}"
@@ -222,7 +308,7 @@ async def cancel_job(job_id: str):
     
     Only jobs that haven't started processing can be cancelled.
     """
-    logger.info(f"Cancel request for job {job_id}")
+    logger.info("Cancel request for job %s", job_id)
     
     try:
         # TODO: Implement actual cancellation logic
@@ -230,55 +316,32 @@ async def cancel_job(job_id: str):
         return {
             "job_id": job_id,
             "status": "cancelled",
-            "cancelled_at": datetime.utcnow().isoformat()
+            "cancelled_at": iso_now()
         }
         
     except Exception as e:
-        logger.error(f"Error cancelling job: {e}", exc_info=True)
+        logger.error("Error cancelling job: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to cancel job: {str(e)}"
         )
 
 
-# ===== Startup Event =====
-
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    logger.info("=== Seller Crosspost Service Starting ===")
-    logger.info("Service: TalknShop Seller Crosspost")
-    logger.info("Version: 1.0.0")
-    logger.info("Port: 8003")
-    
-    # TODO: Initialize connections
-    # - AWS SQS clients
-    # - DynamoDB clients
-    # - Marketplace API clients
-    
-    logger.info("=== Service Ready ===")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
-    logger.info("=== Seller Crosspost Service Shutting Down ===")
-    
-    # TODO: Cleanup
-    # - Close AWS connections
-    # - Flush pending jobs
-    
-    logger.info("=== Shutdown Complete ===")
-
-
 # ===== Main Entry Point =====
 
 if __name__ == "__main__":
+    # One worker per core outside development: a single event loop caps
+    # throughput regardless of CPU count. uvloop/httptools come with
+    # uvicorn[standard] and are worth ~2-4x loop throughput.
+    dev = os.environ.get("ENVIRONMENT", "development") == "development"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8003,
-        reload=True,
+        workers=1 if dev else int(os.getenv("UVICORN_WORKERS", os.cpu_count() or 1)),
+        reload=dev,
+        loop="uvloop",
+        http="httptools",
         log_level="info"
     )
 
@@ -0,0 +1,33 @@
+"""
+Optional compiled build for the adapter package.
+
+The adapter transform helpers (_truncate_title, _limit_images, the
+category/condition maps) are pure dict/string munging called per listing
+per marketplace; Cython's pure-Python mode compiles them unchanged for a
+2-5x speedup at bulk-import time.
+
+Build in place (requires `pip install cython`):
+
+    python setup.py build_ext --inplace
+
+Python falls back to the plain .py modules when no compiled .so is
+present, so this step is entirely optional.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        ["adapters/*.py"],
+        language_level=3,
+        exclude=["adapters/__init__.py"]
+    )
+except ImportError:
+    ext_modules = []
+
+setup(
+    name="seller-crosspost-adapters",
+    version="1.0.0",
+    ext_modules=ext_modules,
+)